@@ -1,40 +1,102 @@
-from flask import Flask, send_from_directory
+from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from .config import Config
+from .config import get_config, engine_options, replica_binds
+from .utils.replicas import RoutingSession
 import os
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
-def create_app():
+def init_services(app):
+    """Apply ``app``'s settings to the process-wide services: module
+    singletons (password pool, caches, event broker, ...) that other
+    modules import directly."""
+    from app.utils.passwords import init_password_service
+    from app.utils.cache import init_response_cache
+    from app.utils.jwt_utils import init_auth_caches
+    from app.utils.events import init_events
+    from app.utils.replicas import init_replicas
+    from app.utils.deletion import init_deletion
+    from app.utils.images import init_images
+
+    for init in (init_password_service, init_response_cache, init_auth_caches,
+                 init_events, init_replicas, init_deletion, init_images):
+        init(app)
+
+
+def create_app(config=None):
+    """``config`` is a config class or a profile name (development,
+    testing, production); by default APP_ENV picks the profile."""
     app = Flask(
         __name__,
         static_url_path="/static",
         static_folder="static",
         instance_relative_config=True
     )
-    app.config.from_object(Config)
+    if config is None or isinstance(config, str):
+        config = get_config(config)
+    app.config.from_object(config)
+    if not app.config.get("SECRET_KEY"):
+        raise RuntimeError("SECRET_KEY is not set; it signs the login tokens")
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    app.config.setdefault("SQLALCHEMY_BINDS", replica_binds(app.config))
+
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    init_services(app)
 
     # Extensions
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=["X-Next-Cursor", "Retry-After"])
     db.init_app(app)
     migrate.init_app(app, db)
 
+    from app.utils.sql import configure_sqlite_engine
+    from app.utils.query_stats import init_query_stats
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_sqlite_engine(engine, app.config["SQLITE_PRAGMAS"])
+        init_query_stats(app, db.engines.values())
+
     # ------------------------------------
     # Register ALL route blueprints here
     # ------------------------------------
     from app.routes import register_routes
     register_routes(app)
 
+    from app.commands import register_commands
+    register_commands(app)
+
+    # before compression: after_request hooks run in reverse, so request
+    # latency includes compressing the body
+    from app.utils.metrics import init_metrics
+    init_metrics(app)
+
+    from app.utils.compression import init_compression
+    init_compression(app)
+
+    from app.utils.pagination import PaginationError
+
+    @app.errorhandler(PaginationError)
+    def handle_pagination_error(error):
+        return jsonify({"error": str(error)}), 400
+
+    from app.utils.passwords import PasswordServiceBusy
+
+    @app.errorhandler(PasswordServiceBusy)
+    def handle_password_service_busy(error):
+        return jsonify({"error": str(error)}), 503, {"Retry-After": "1"}
+
+    from app.utils.static_files import send_upload
+
     # --------------------------
     # Fallback route for property images
     # --------------------------
     @app.route("/uploads/properties/<filename>")
     def serve_property_image(filename):
         uploads_path = os.path.join(app.static_folder, "uploads", "properties")
-        return send_from_directory(uploads_path, filename)
+        return send_upload(uploads_path, filename)
 
     # --------------------------
     # Fallback route for profile images
@@ -42,6 +104,26 @@ def create_app():
     @app.route("/uploads/profile_images/<filename>")
     def serve_profile_image(filename):
         uploads_path = os.path.join(app.static_folder, "uploads", "profile_images")
-        return send_from_directory(uploads_path, filename)
+        return send_upload(uploads_path, filename)
+
+    # --------------------------
+    # Content-addressed media store
+    # --------------------------
+    @app.route("/uploads/media/<filename>")
+    def serve_media(filename):
+        from app.utils.media import get_media_root
+        return send_upload(os.path.join(get_media_root(), filename[:2]), filename)
+
+    # --------------------------
+    # /static/uploads/... gets the same caching as the routes above
+    # --------------------------
+    send_static_file = app.view_functions["static"]
+
+    def serve_static(filename):
+        if filename.startswith("uploads/"):
+            return send_upload(app.static_folder, filename)
+        return send_static_file(filename=filename)
+
+    app.view_functions["static"] = serve_static
 
     return app
@@ -0,0 +1,113 @@
+import click
+
+
+# app/commands.py
+def register_commands(app):
+
+    # ------------------------------------------------
+    # flask reconcile-counts
+    # ------------------------------------------------
+    @app.cli.command("reconcile-counts")
+    @click.option("--dry-run", is_flag=True, help="Report drift without fixing it.")
+    def reconcile_counts(dry_run):
+        """Recompute Post.like_count / Post.comment_count from the source rows."""
+        from app.utils.counters import find_counter_drift, reconcile_post_counters
+
+        drift = find_counter_drift() if dry_run else reconcile_post_counters()
+
+        for post_id, like_count, likes, comment_count, comments in drift:
+            click.echo(
+                f"post {post_id}: likes {like_count} -> {likes}, "
+                f"comments {comment_count} -> {comments}"
+            )
+
+        verb = "found" if dry_run else "fixed"
+        click.echo(f"{len(drift)} post(s) with drifted counters {verb}.")
+
+    # ------------------------------------------------
+    # flask check-query-plans
+    # ------------------------------------------------
+    @app.cli.command("check-query-plans")
+    @click.option("--verbose", "-v", is_flag=True, help="Print every plan, not just failures.")
+    def check_plans(verbose):
+        """EXPLAIN every list route query; exit 1 on a full scan or sort."""
+        from app.utils.query_plans import check_query_plans
+
+        failed = 0
+        for name, plan, problems in check_query_plans():
+            if problems:
+                failed += 1
+                click.echo(f"FAIL {name}")
+                for line in problems:
+                    click.echo(f"    {line}")
+            elif verbose:
+                click.echo(f"ok   {name}")
+                for line in plan:
+                    click.echo(f"    {line}")
+
+        if failed:
+            raise SystemExit(1)
+        click.echo("All route queries use indexes.")
+
+    # ------------------------------------------------
+    # flask media-gc / flask import-legacy-media
+    # ------------------------------------------------
+    @app.cli.command("media-gc")
+    def media_gc():
+        """Delete stored media files that nothing references any more."""
+        from app.utils.media import collect_media_garbage
+
+        click.echo(f"Removed {collect_media_garbage()} unreferenced media file(s).")
+
+    @app.cli.command("import-legacy-media")
+    def import_legacy():
+        """Move filename-based uploads into the content-addressed store."""
+        from app.utils.media import import_legacy_media
+
+        click.echo(f"Rewrote {import_legacy_media()} image URL(s).")
+
+    # ------------------------------------------------
+    # flask generate-image-variants
+    # ------------------------------------------------
+    @app.cli.command("generate-image-variants")
+    def generate_image_variants():
+        """Backfill thumb/card/full variants for every stored image."""
+        from app.models.media import MediaBlob
+        from app.utils.media import get_media_root
+        from app.utils.images import schedule_variants
+
+        media_root = get_media_root()
+        futures = [
+            schedule_variants(media_root, f"{blob.digest}.{blob.extension}")
+            for blob in MediaBlob.query.filter(MediaBlob.ref_count > 0)
+        ]
+        futures = [f for f in futures if f is not None]
+        for future in futures:
+            future.result()
+        click.echo(f"Generated variants for {len(futures)} image(s).")
+
+    # ------------------------------------------------
+    # flask rebuild-stats
+    # ------------------------------------------------
+    @app.cli.command("rebuild-stats")
+    def rebuild_stats_command():
+        """Recompute the admin dashboard rollup from the source tables."""
+        from app.utils.stats import rebuild_stats
+
+        for name, value in rebuild_stats().items():
+            click.echo(f"{name}: {value}")
+
+    # ------------------------------------------------
+    # flask rebuild-search-index
+    # ------------------------------------------------
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index():
+        """Re-create the property full-text index (SQLite only; the Postgres
+        tsvector column is generated and always current)."""
+        from app.utils.search import rebuild_property_index
+
+        count = rebuild_property_index()
+        if count is None:
+            click.echo("Nothing to do: the Postgres index is maintained by the database.")
+        else:
+            click.echo(f"Indexed {count} approved propert{'y' if count == 1 else 'ies'}.")
@@ -1,8 +1,226 @@
 import os
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, '..', 'instance', 'data.db')}"
+
+
+def _normalize_url(url):
+    # Heroku-style URLs; SQLAlchemy only accepts "postgresql://"
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def _database_url(default=DEFAULT_DATABASE_URL):
+    return _normalize_url(os.environ.get("DATABASE_URL", default))
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
 
 class Config:
-    SECRET_KEY = "supersecretkey"
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(BASE_DIR, '..', 'instance', 'data.db')}"
+    SECRET_KEY = os.environ.get("SECRET_KEY", "supersecretkey")
+    SQLALCHEMY_DATABASE_URI = _database_url()
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool (QueuePool). SQLALCHEMY_ENGINE_OPTIONS is built from
+    # these in create_app unless a profile sets it outright.
+    DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+    DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)            # seconds waiting for a connection
+    DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)          # seconds; under server idle timeouts
+    DB_STATEMENT_TIMEOUT_MS = _env_int("DB_STATEMENT_TIMEOUT_MS", 30000)  # Postgres only
+
+    # Applied to every SQLite connection (app/utils/sql.py). WAL lets readers
+    # run alongside the writer, busy_timeout makes writers wait for the lock
+    # instead of failing with "database is locked".
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "busy_timeout": 5000,         # ms
+        "synchronous": "NORMAL",      # safe with WAL; fsync at checkpoints
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,     # negative = KiB, i.e. 64 MiB per connection
+    }
+
+    # Read replicas (app/utils/replicas.py): comma-separated URLs, each
+    # becoming a replica_<n> bind. @read_only handlers read from one of them;
+    # a user who wrote in the last REPLICA_STICKY_SECONDS reads from the
+    # primary, and a replica that fails to connect is skipped for
+    # REPLICA_RETRY_AFTER seconds.
+    DATABASE_REPLICA_URLS = [
+        url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    REPLICA_STICKY_SECONDS = 5
+    REPLICA_STICKY_SIZE = 10000
+    REPLICA_RETRY_AFTER = 30          # seconds
+
+    # Per-request SQL instrumentation (app/utils/query_stats.py): statement
+    # count and time as a Server-Timing header and one log line per request.
+    # A statement shape that runs SQL_N_PLUS_ONE_THRESHOLD times in one
+    # request is logged as a likely N+1; strict mode raises NPlusOneError.
+    SQL_INSTRUMENTATION = os.environ.get("SQL_INSTRUMENTATION", "1") == "1"
+    SQL_SERVER_TIMING = True
+    SQL_N_PLUS_ONE_THRESHOLD = 10
+    SQL_N_PLUS_ONE_STRICT = False
+
+    # Prometheus /metrics (app/utils/metrics.py; needs prometheus_client).
+    # With METRICS_TOKEN set, scrapes must send "Authorization: Bearer <token>".
+    # For several workers set PROMETHEUS_MULTIPROC_DIR, see gunicorn.conf.py.
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+    # Keyset pagination for list endpoints
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    # Authenticated-principal cache used by token_required. Invalidation goes
+    # through the response cache backend below: with "local" and several
+    # worker processes, other workers see a changed user (e.g. a revoked
+    # admin) only after PRINCIPAL_CACHE_TTL
+    PRINCIPAL_CACHE_SIZE = 1024
+    PRINCIPAL_CACHE_TTL = 60          # seconds
+    TOKEN_CACHE_SIZE = 4096
+
+    # bcrypt runs in a bounded process pool (workers=0 hashes inline)
+    BCRYPT_ROUNDS = 12
+    PASSWORD_POOL_WORKERS = _env_int("PASSWORD_POOL_WORKERS", 2)
+    PASSWORD_POOL_MAX_PENDING = _env_int("PASSWORD_POOL_MAX_PENDING", 16)
+    PASSWORD_HASH_TIMEOUT = 10        # seconds
+
+    # Background thumbnail / responsive image generation
+    IMAGE_WORKERS = 2
+
+    # Bulk moderation endpoints: ids per request, and ids per UPDATE/DELETE
+    # (kept under SQLite's bound-parameter limit)
+    BULK_MODERATION_MAX_IDS = 1000
+    BULK_MODERATION_BATCH_SIZE = 500
+
+    # User deletion: rows per DELETE chunk, and the size above which the
+    # admin route hands the work to a background job. A job without progress
+    # for DELETION_JOB_STALE_AFTER seconds is taken as dead (its worker was
+    # recycled or crashed) and the deletion can be started again.
+    DELETION_CHUNK_SIZE = 500
+    DELETION_INLINE_LIMIT = 1000
+    DELETION_WORKERS = 1
+    DELETION_JOB_STALE_AFTER = _env_int("DELETION_JOB_STALE_AFTER", 300)
+
+    # Upload serving: max-age for files not named by content hash, and an
+    # optional nginx internal location (e.g. "/protected") for X-Accel-Redirect.
+    # USE_X_SENDFILE = True hands the send to Apache/lighttpd instead.
+    UPLOAD_CACHE_MAX_AGE = 3600
+    UPLOAD_ACCEL_REDIRECT_PREFIX = None
+
+    # Cache for user-independent responses: "local" (in-process LRU) or
+    # "redis" (shared between workers, needs the redis package)
+    RESPONSE_CACHE_BACKEND = os.environ.get("RESPONSE_CACHE_BACKEND", "local")
+    RESPONSE_CACHE_URL = os.environ.get("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_SIZE = 512
+    RESPONSE_CACHE_TTL = 60           # seconds
+
+    # Live feed (Server-Sent Events): "local" keeps events in-process, so
+    # clients only see writes handled by the same worker; "redis" shares one
+    # stream between workers. Each open stream holds a worker thread, and
+    # streams close after EVENT_STREAM_MAX_AGE (clients reconnect and resume).
+    EVENT_BROKER_BACKEND = os.environ.get("EVENT_BROKER_BACKEND", "local")
+    EVENT_BROKER_URL = os.environ.get("EVENT_BROKER_URL", "redis://localhost:6379/0")
+    EVENT_BUFFER_SIZE = 1000          # events kept for Last-Event-ID resume
+    EVENT_STREAM_KEEPALIVE = 15       # seconds
+    EVENT_STREAM_MAX_AGE = 300        # seconds
+    STREAM_TICKET_TTL = 60            # seconds; ?ticket= credential for opening a stream
+    # Open streams per process; more get 503. None = unlimited (the dev
+    # server starts a thread per request). gunicorn.conf.py sets this from
+    # the worker class: 0 for sync, half the threads for gthread.
+    EVENT_STREAM_MAX_CONNECTIONS = (
+        int(os.environ["EVENT_STREAM_MAX_CONNECTIONS"]) if os.environ.get("EVENT_STREAM_MAX_CONNECTIONS") else None
+    )
+
+    # Response compression (app/utils/compression.py); "br" is only offered
+    # when the brotli package is installed
+    COMPRESS_ALGORITHMS = ("br", "gzip")   # server preference on equal q
+    COMPRESS_MIMETYPES = {
+        "application/json",
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/csv",
+        "application/javascript",
+        "image/svg+xml",
+    }
+    COMPRESS_MIN_SIZE = 1024          # bytes; smaller bodies aren't worth it
+    COMPRESS_LEVEL = 6                # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = 4       # brotli 0-11
+
+
+# ------------------------------------------------
+# PROFILES (APP_ENV)
+# ------------------------------------------------
+class DevelopmentConfig(Config):
+    # debug mode is switched on by run.py, not here
+    SQLALCHEMY_ECHO = os.environ.get("SQLALCHEMY_ECHO") == "1"
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get("TEST_DATABASE_URL", "sqlite://")
+    SQL_N_PLUS_ONE_STRICT = True
+    # cheap, inline hashing: no pool processes to spawn in tests
+    BCRYPT_ROUNDS = 4
+    PASSWORD_POOL_WORKERS = 0
+
+
+class ProductionConfig(Config):
+    # no fallback: tokens signed with the default key could be forged by anyone
+    # who has read this file. create_app refuses to start without one.
+    SECRET_KEY = os.environ.get("SECRET_KEY")
+    DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+    DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 20)
+
+
+PROFILES = {
+    "development": DevelopmentConfig,
+    "testing": TestingConfig,
+    "production": ProductionConfig,
+}
+
+
+def get_config(name=None):
+    """Config class for ``name`` or the APP_ENV environment variable."""
+    name = name or os.environ.get("APP_ENV", "development")
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown APP_ENV {name!r}; expected one of: {', '.join(PROFILES)}")
+
+
+def engine_options(config, url=None):
+    """SQLALCHEMY_ENGINE_OPTIONS for ``url`` (default: the primary database)."""
+    url = url or config["SQLALCHEMY_DATABASE_URI"]
+    options = {"pool_pre_ping": True}
+
+    if url.startswith("sqlite"):
+        # in-memory databases use a single shared connection, no sizing
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            return options
+        options["connect_args"] = {"timeout": config["SQLITE_PRAGMAS"].get("busy_timeout", 5000) / 1000}
+    elif url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"}
+
+    from app.utils.metrics import TimedQueuePool  # reports checkout waits to /metrics
+
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT"],
+        pool_recycle=config["DB_POOL_RECYCLE"],
+    )
+    return options
+
+
+def replica_binds(config):
+    """SQLALCHEMY_BINDS entries for DATABASE_REPLICA_URLS."""
+    return {
+        f"replica_{i}": dict(engine_options(config, _normalize_url(url)), url=_normalize_url(url))
+        for i, url in enumerate(config["DATABASE_REPLICA_URLS"])
+    }
@@ -2,3 +2,8 @@
 from .user import User
 from .post import Post
 from .like import Like   # <--- IMPORT IT HERE
+from .comment import Comment
+from .property import Property
+from .media import MediaBlob
+from .stats import StatCounter
+from .deletion_job import DeletionJob
@@ -0,0 +1,20 @@
+# models/deletion_job.py
+from app import db
+from datetime import datetime
+
+class DeletionJob(db.Model):
+    __tablename__ = "deletion_job"
+
+    # Background deletion of a user and everything that references it
+    # (app.utils.deletion); rows stay behind as a record once finished
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)  # no FK: the job outlives the user
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done, failed
+    total = db.Column(db.Integer, nullable=False, default=0)     # rows expected, counted up front
+    deleted = db.Column(db.Integer, nullable=False, default=0)   # rows removed so far
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # heartbeat: set when queued / started and after every chunk, so a job
+    # whose worker died (recycle, crash) shows up as stale
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,13 @@
+# models/media.py
+from app import db
+from datetime import datetime
+
+class MediaBlob(db.Model):
+    __tablename__ = "media_blob"
+
+    # sha256 of the file contents; the file lives at uploads/media/<digest[:2]>/<digest>.<extension>
+    digest = db.Column(db.String(64), primary_key=True)
+    extension = db.Column(db.String(10), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # rows whose image URL points here
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -6,8 +6,17 @@ class Post(db.Model):
     __tablename__ = "post"  # optional but explicit
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", name="fk_post_user_id_user", ondelete="CASCADE"), nullable=False)
     content = db.Column(db.Text, nullable=False)
     image_url = db.Column(db.String(255), nullable=True)
     status = db.Column(db.String(20), default="visible")  # visible, hidden
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Denormalized counters, maintained by the like/comment routes
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        db.Index("ix_post_created_at_id", "created_at", "id"),                 # feed, admin list
+        db.Index("ix_post_user_id_created_at_id", "user_id", "created_at", "id"),  # my-posts
+    )
@@ -1,12 +1,13 @@
 # models/property.py
 from app import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 class Property(db.Model):
     __tablename__ = "property"  # optional but explicit
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", name="fk_property_user_id_user", ondelete="CASCADE"), nullable=False)
     title = db.Column(db.String(120), nullable=False)
     description = db.Column(db.Text, nullable=True)
     price = db.Column(db.Float, nullable=True)
@@ -14,3 +15,31 @@ class Property(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     image_url = db.Column(db.String(255), nullable=True)
     listing_type = db.Column(db.String(10), default="")  # <--- NEW FIELD
+
+    __table_args__ = (
+        db.Index("ix_property_created_at_id", "created_at", "id"),                    # admin list
+        db.Index("ix_property_status_created_at_id", "status", "created_at", "id"),      # approved listing
+        db.Index("ix_property_user_id_created_at_id", "user_id", "created_at", "id"),    # my-properties
+        # /properties/all filters and sorts; the last one also covers the facet query
+        db.Index("ix_property_status_listing_type_created_at_id", "status", "listing_type", "created_at", "id"),
+        db.Index("ix_property_status_price_id", "status", "price", "id"),
+        db.Index("ix_property_status_listing_type_price_id", "status", "listing_type", "price", "id"),
+    )
+
+
+# ------------------------------------------------
+# Full-text index (see app/utils/search.py). Created alongside the table so
+# db.create_all() matches the migrations.
+# ------------------------------------------------
+event.listen(Property.__table__, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS property_fts USING fts5(title, description)"
+).execute_if(dialect="sqlite"))
+
+event.listen(Property.__table__, "after_create", DDL(
+    "ALTER TABLE property ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+).execute_if(dialect="postgresql"))
+
+event.listen(Property.__table__, "after_create", DDL(
+    "CREATE INDEX ix_property_search_vector ON property USING GIN (search_vector)"
+).execute_if(dialect="postgresql"))
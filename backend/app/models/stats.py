@@ -0,0 +1,10 @@
+# models/stats.py
+from app import db
+
+class StatCounter(db.Model):
+    __tablename__ = "stat_counter"
+
+    # One row per dashboard figure (total_users, pending_properties, ...),
+    # kept current by the write routes via app.utils.stats
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0, server_default="0")
@@ -1,5 +1,5 @@
 from app import db
-import bcrypt
+from app.utils.passwords import password_service
 
 
 class User(db.Model):
@@ -11,7 +11,7 @@ class User(db.Model):
     profile_image_url = db.Column(db.String(200), nullable=True)  # ← Add this
 
     def set_password(self, raw_password):
-        self.password = bcrypt.hashpw(raw_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password = password_service.hash_password(raw_password)
 
     def check_password(self, raw_password):
-        return bcrypt.checkpw(raw_password.encode('utf-8'), self.password.encode('utf-8'))
+        return password_service.verify(raw_password, self.password)
@@ -1,25 +1,60 @@
 from flask import Blueprint, jsonify
-from app.utils.jwt_utils import token_required, admin_required
-from app.models.user import User
-from app.models.post import Post
-from app.models.property import Property
+from app.utils.jwt_utils import token_required, admin_required, principal_cache_stats
+from app.utils.replicas import read_only, replica_pool
+from app.utils.cache import response_cache
+from app.utils.compression import compression_stats
+from app.utils.stats import get_stats
+from app.routes.admin.users import admin_users_page
+from app.routes.admin.posts import admin_posts_page
+from app.routes.admin.properties import admin_properties_page
 
 admin_dashboard_bp = Blueprint("admin_dashboard", __name__)
 
 @admin_dashboard_bp.get("/stats")
 @token_required
 @admin_required
+@read_only
 def get_dashboard_stats(current_user):
-    total_users = User.query.count()
-    total_posts = Post.query.count()
-    total_properties = Property.query.count()
-    pending_properties = Property.query.filter_by(status="pending").count()
-    approved_properties = Property.query.filter_by(status="approved").count()
-
-    return jsonify({
-        "total_users": total_users,
-        "total_posts": total_posts,
-        "total_properties": total_properties,
-        "pending_properties": pending_properties,
-        "approved_properties": approved_properties
-    })
+    # Read from the incrementally maintained rollup, see app/utils/stats.py
+    return jsonify(get_stats())
+
+
+# Everything the admin dashboard shows, in one request: authenticates once
+# and returns the stats rollup plus the first page of each list. Each
+# section takes its own <section>_limit / <section>_cursor.
+@admin_dashboard_bp.get("/bootstrap")
+@token_required
+@admin_required
+@read_only
+def get_bootstrap(current_user):
+    sections = {
+        "users": admin_users_page,
+        "posts": admin_posts_page,
+        "properties": admin_properties_page,
+    }
+    payload = {"stats": get_stats()}
+    for name, page in sections.items():
+        items, next_cursor = page(prefix=f"{name}_")
+        payload[name] = {"items": items, "next_cursor": next_cursor}
+    return jsonify(payload), 200
+
+
+@admin_dashboard_bp.get("/cache-stats")
+@token_required
+@admin_required
+def get_cache_stats(current_user):
+    return jsonify(dict(principal_cache_stats(), responses=response_cache.stats()))
+
+
+@admin_dashboard_bp.get("/compression-stats")
+@token_required
+@admin_required
+def get_compression_stats(current_user):
+    return jsonify(compression_stats.stats())
+
+
+@admin_dashboard_bp.get("/replica-stats")
+@token_required
+@admin_required
+def get_replica_stats(current_user):
+    return jsonify(replica_pool.stats())
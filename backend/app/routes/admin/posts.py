@@ -1,5 +1,15 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from app.utils.jwt_utils import token_required, admin_required
+from app.utils.replicas import read_only
+from app.utils.pagination import keyset_paginate, list_response
+from app.utils.cache import response_cache, post_comments_namespace
+from app.utils.deletion import delete_post_rows
+from app.utils.events import publish_post_deleted
+from app.utils.moderation import (
+    BulkRequestError, POST_ACTIONS, POST_FILTERS,
+    parse_bulk_request, bulk_moderate_posts, bulk_response
+)
+from app.utils.serializers import columns, row_dicts, ADMIN_POST_FIELDS
 from app.models.post import Post
 from app.models.user import User
 from app import db
@@ -10,21 +20,23 @@ admin_posts_bp = Blueprint("admin_posts", __name__)
 @admin_posts_bp.get("/all")
 @token_required
 @admin_required
+@read_only
 def get_all_posts(current_user):
-    posts = Post.query.order_by(Post.created_at.desc()).all()
-    post_list = []
-    for p in posts:
-        user = User.query.get(p.user_id)
-        post_list.append({
-            "id": p.id,
-            "user_id": p.user_id,
-            "user_name": user.name if user else "Unknown",
-            "content": p.content,
-            "image_url": p.image_url,
-            "status": p.status,
-            "created_at": p.created_at.isoformat()
-        })
-    return jsonify(post_list), 200
+    post_list, next_cursor = admin_posts_page()
+    return list_response(post_list, next_cursor), 200
+
+
+# One page of posts with author names from a single joined query;
+# shared with the /api/admin/bootstrap endpoint
+def admin_posts_page(prefix=""):
+    rows, next_cursor = keyset_paginate(
+        db.session.query(*columns(ADMIN_POST_FIELDS))
+        .select_from(Post)
+        .outerjoin(User, User.id == Post.user_id),
+        (Post.created_at, Post.id),
+        prefix=prefix
+    )
+    return row_dicts(rows, ADMIN_POST_FIELDS), next_cursor
 
 
 # DELETE a post
@@ -36,6 +48,28 @@ def delete_post(current_user, post_id):
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
-    db.session.delete(post)
+    delete_post_rows([post_id])
     db.session.commit()
+    response_cache.invalidate(post_comments_namespace(post_id))
+    publish_post_deleted(post_id)
     return jsonify({"message": "Post deleted successfully"}), 200
+
+
+# BULK delete posts
+# Body: {"action": "delete", "ids": [...]} or {"action": "delete", "filter": {"user_id": 5}}
+@admin_posts_bp.post("/bulk")
+@token_required
+@admin_required
+def bulk_posts(current_user):
+    try:
+        action, ids = parse_bulk_request(request.get_json(silent=True), POST_ACTIONS, POST_FILTERS, Post)
+    except BulkRequestError as e:
+        return jsonify({"error": str(e)}), 400
+
+    outcomes = bulk_moderate_posts(action, ids)
+    db.session.commit()
+    for post_id, outcome in outcomes.items():
+        if outcome == "deleted":
+            response_cache.invalidate(post_comments_namespace(post_id))
+            publish_post_deleted(post_id)
+    return jsonify(bulk_response(outcomes)), 200
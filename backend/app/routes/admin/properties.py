@@ -1,5 +1,16 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from app.utils.jwt_utils import token_required, admin_required
+from app.utils.replicas import read_only
+from app.utils.pagination import keyset_paginate, list_response
+from app.utils.media import release_media
+from app.utils.cache import response_cache, APPROVED_PROPERTIES
+from app.utils.stats import bump_stats, property_status_deltas
+from app.utils.search import sync_property_index, unindex_properties
+from app.utils.moderation import (
+    BulkRequestError, PROPERTY_ACTIONS, PROPERTY_FILTERS,
+    parse_bulk_request, bulk_moderate_properties, bulk_response
+)
+from app.utils.serializers import columns, row_dicts, ADMIN_PROPERTY_FIELDS
 from app.models.property import Property
 from app.models.user import User
 from app import db
@@ -10,22 +21,23 @@ admin_properties_bp = Blueprint("admin_properties", __name__)
 @admin_properties_bp.get("/all")
 @token_required
 @admin_required
+@read_only
 def get_all_properties(current_user):
-    properties = Property.query.order_by(Property.created_at.desc()).all()
-    prop_list = []
-    for p in properties:
-        user = User.query.get(p.user_id)
-        prop_list.append({
-            "id": p.id,
-            "user_id": p.user_id,
-            "user_name": user.name if user else "Unknown",
-            "title": p.title,
-            "description": p.description,
-            "price": p.price,
-            "status": p.status,
-            "created_at": p.created_at.isoformat()
-        })
-    return jsonify(prop_list), 200
+    prop_list, next_cursor = admin_properties_page()
+    return list_response(prop_list, next_cursor), 200
+
+
+# One page of properties with owner names from a single joined query;
+# shared with the /api/admin/bootstrap endpoint
+def admin_properties_page(prefix=""):
+    rows, next_cursor = keyset_paginate(
+        db.session.query(*columns(ADMIN_PROPERTY_FIELDS))
+        .select_from(Property)
+        .outerjoin(User, User.id == Property.user_id),
+        (Property.created_at, Property.id),
+        prefix=prefix
+    )
+    return row_dicts(rows, ADMIN_PROPERTY_FIELDS), next_cursor
 
 
 # APPROVE property
@@ -37,8 +49,11 @@ def approve_property(current_user, property_id):
     if not prop:
         return jsonify({"error": "Property not found"}), 404
 
+    bump_stats(**property_status_deltas(prop.status, "approved"))
     prop.status = "approved"
+    sync_property_index(prop)
     db.session.commit()
+    response_cache.invalidate(APPROVED_PROPERTIES)
     return jsonify({"message": "Property approved"}), 200
 
 
@@ -51,8 +66,11 @@ def decline_property(current_user, property_id):
     if not prop:
         return jsonify({"error": "Property not found"}), 404
 
+    bump_stats(**property_status_deltas(prop.status, "declined"))
     prop.status = "declined"
+    sync_property_index(prop)
     db.session.commit()
+    response_cache.invalidate(APPROVED_PROPERTIES)
     return jsonify({"message": "Property declined"}), 200
 
 
@@ -65,6 +83,28 @@ def delete_property(current_user, property_id):
     if not prop:
         return jsonify({"error": "Property not found"}), 404
 
+    release_media(prop.image_url)
+    bump_stats(**property_status_deltas(prop.status, None, total=-1))
+    unindex_properties([prop.id])
     db.session.delete(prop)
     db.session.commit()
+    response_cache.invalidate(APPROVED_PROPERTIES)
     return jsonify({"message": "Property deleted"}), 200
+
+
+# BULK approve / decline / delete
+# Body: {"action": "approve" | "decline" | "delete",
+#        "ids": [...]} or {"action": ..., "filter": {"status": "pending"}}
+@admin_properties_bp.post("/bulk")
+@token_required
+@admin_required
+def bulk_properties(current_user):
+    try:
+        action, ids = parse_bulk_request(request.get_json(silent=True), PROPERTY_ACTIONS, PROPERTY_FILTERS, Property)
+    except BulkRequestError as e:
+        return jsonify({"error": str(e)}), 400
+
+    outcomes = bulk_moderate_properties(action, ids)
+    db.session.commit()
+    response_cache.invalidate(APPROVED_PROPERTIES)
+    return jsonify(bulk_response(outcomes)), 200
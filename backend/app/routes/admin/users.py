@@ -1,6 +1,13 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 from app.utils.jwt_utils import token_required, admin_required
+from app.utils.replicas import read_only
+from app.utils.pagination import keyset_paginate, list_response
+from app.utils.deletion import (
+    count_user_rows, delete_users, start_user_deletion, active_job, fail_stale_jobs, job_json
+)
+from app.utils.serializers import columns, row_dicts, USER_FIELDS
 from app.models.user import User
+from app.models.deletion_job import DeletionJob
 from app import db
 
 admin_users_bp = Blueprint("admin_users", __name__)
@@ -9,27 +16,51 @@ admin_users_bp = Blueprint("admin_users", __name__)
 @admin_users_bp.get("/all")
 @token_required
 @admin_required
+@read_only
 def get_all_users(current_user):
-    users = User.query.order_by(User.id.desc()).all()
-    return jsonify([{
-        "id": u.id,
-        "name": u.name,
-        "email": u.email,
-        "is_admin": u.is_admin,
-        "profile_image_url": u.profile_image_url
-    } for u in users]), 200
+    user_list, next_cursor = admin_users_page()
+    return list_response(user_list, next_cursor), 200
 
 
-# DELETE user
+# One page of users; shared with the /api/admin/bootstrap endpoint
+def admin_users_page(prefix=""):
+    users, next_cursor = keyset_paginate(
+        db.session.query(*columns(USER_FIELDS)), (User.id,), prefix=prefix
+    )
+    return row_dicts(users, USER_FIELDS), next_cursor
+
+
+# DELETE user, with their posts, likes, comments, listings and images.
+# Small accounts are removed inline; larger ones by a background job whose
+# progress is at /delete-jobs/<job_id>.
 @admin_users_bp.delete("/delete/<int:user_id>")
 @token_required
 @admin_required
 def delete_user(current_user, user_id):
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    db.session.delete(user)
-    db.session.commit()
+    job = active_job(user_id)
+    if job:
+        return jsonify({"message": "User deletion in progress", "job": job_json(job)}), 202
+
+    total = count_user_rows([user_id])
+    if total <= current_app.config["DELETION_INLINE_LIMIT"]:
+        delete_users([user_id])
+        return jsonify({"message": "User deleted successfully"}), 200
+
+    job = start_user_deletion(user_id, total)
+    return jsonify({"message": "User deletion started", "job": job_json(job)}), 202
 
-    return jsonify({"message": "User deleted successfully"}), 200
+
+# Progress of a background user deletion
+@admin_users_bp.get("/delete-jobs/<int:job_id>")
+@token_required
+@admin_required
+def get_deletion_job(current_user, job_id):
+    fail_stale_jobs(DeletionJob.id == job_id)
+    job = db.session.get(DeletionJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_json(job)), 200
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.user import User
-from app.utils.jwt_utils import create_token
+from app.utils.jwt_utils import create_token, invalidate_principal
+from app.utils.passwords import password_service
+from app.utils.stats import bump_stats
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -30,6 +32,7 @@ def register():
     user.set_password(data["password"])
 
     db.session.add(user)
+    bump_stats(total_users=1)
     db.session.commit()
 
     # CREATE TOKEN
@@ -55,9 +58,20 @@ def login():
 
     user = User.query.filter_by(email=data["email"]).first()
 
-    if not user or not user.check_password(data["password"]):
+    if not user:
+        # Same bcrypt cost as a real check, so unknown emails aren't faster
+        password_service.dummy_verify(data["password"])
         return jsonify({"error": "Invalid email or password"}), 401
 
+    if not user.check_password(data["password"]):
+        return jsonify({"error": "Invalid email or password"}), 401
+
+    # Upgrade the stored hash when BCRYPT_ROUNDS has changed
+    if password_service.needs_rehash(user.password):
+        user.set_password(data["password"])
+        db.session.commit()
+        invalidate_principal(user.id)
+
     token = create_token(user.id)
 
     return jsonify({
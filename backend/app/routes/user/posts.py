@@ -1,9 +1,19 @@
-from flask import Blueprint, request, jsonify
-from app.utils.jwt_utils import token_required
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from app.utils.jwt_utils import token_required, stream_token_required, create_stream_ticket
+from app.utils.replicas import read_only
 from app.models.post import Post
 from app.models.user import User
-from app.models.like import Like
 from app.models.comment import Comment
+from app.utils.feed import community_feed_query, FEED_FIELDS
+from app.utils.serializers import columns, row_dicts, POST_FIELDS, COMMENT_FIELDS
+from app.utils.counters import bump_post_counters, toggle_post_like
+from app.utils.stats import bump_stats
+from app.utils.deletion import delete_post_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.cache import response_cache, request_cache_key, post_comments_namespace
+from app.utils.events import (
+    latest_event_id, event_stream, stream_slots, publish_post_created, publish_post_deleted, publish_counts
+)
 from app import db
 
 user_posts_bp = Blueprint("user_posts", __name__)
@@ -21,7 +31,9 @@ def create_post(current_user):
 
     post = Post(user_id=current_user.id, content=content, image_url=image_url)
     db.session.add(post)
+    bump_stats(total_posts=1)
     db.session.commit()
+    publish_post_created(post, current_user.name)
 
     return jsonify({
         "message": "Post created successfully",
@@ -41,40 +53,43 @@ def delete_post(current_user, post_id):
     if not post or post.user_id != current_user.id:
         return jsonify({"error": "Post not found or unauthorized"}), 404
 
-    db.session.delete(post)
+    delete_post_rows([post_id])
     db.session.commit()
+    response_cache.invalidate(post_comments_namespace(post_id))
+    publish_post_deleted(post_id)
     return jsonify({"message": f"Post {post_id} deleted"}), 200
 
 # GET all posts by current user
 @user_posts_bp.route("/my-posts", methods=["GET"])
 @token_required
+@read_only
 def get_my_posts(current_user):
-    posts = Post.query.filter_by(user_id=current_user.id).order_by(Post.created_at.desc()).all()
-    result = [{
-        "id": p.id,
-        "content": p.content,
-        "image_url": p.image_url,
-        "created_at": p.created_at
-    } for p in posts]
-    return jsonify({"posts": result}), 200
-
-# Toggle like for a post
+    posts, next_cursor = keyset_paginate(
+        db.session.query(*columns(POST_FIELDS)).filter(Post.user_id == current_user.id),
+        (Post.created_at, Post.id)
+    )
+    return jsonify({"posts": row_dicts(posts, POST_FIELDS), "next_cursor": next_cursor}), 200
+
+# Toggle like for a post; returns the new state and count so the client
+# can update in place
 @user_posts_bp.route("/<int:post_id>/like", methods=["POST"])
 @token_required
 def toggle_like(current_user, post_id):
-    like = Like.query.filter_by(user_id=current_user.id, post_id=post_id).first()
-
-    if like:
-        db.session.delete(like)
-        db.session.commit()
-        return jsonify({"message": "Post unliked"}), 200
-    else:
-        new_like = Like(user_id=current_user.id, post_id=post_id)
-        db.session.add(new_like)
-        db.session.commit()
-        return jsonify({"message": "Post liked"}), 201
-
-# Add a comment
+    result = toggle_post_like(current_user.id, post_id)
+    if result is None:
+        db.session.rollback()
+        return jsonify({"error": "Post not found"}), 404
+
+    liked, likes = result
+    db.session.commit()
+    publish_counts(post_id, likes=likes)
+    return jsonify({
+        "message": "Post liked" if liked else "Post unliked",
+        "liked": liked,
+        "likes": likes
+    }), 201 if liked else 200
+
+# Add a comment; returns it with the post's new comment count
 @user_posts_bp.route("/<int:post_id>/comment", methods=["POST"])
 @token_required
 def add_comment(current_user, post_id):
@@ -83,12 +98,20 @@ def add_comment(current_user, post_id):
     if not content:
         return jsonify({"error": "Content is required"}), 400
 
+    counts = bump_post_counters(post_id, comments=1)
+    if not counts:
+        db.session.rollback()
+        return jsonify({"error": "Post not found"}), 404
+
     comment = Comment(user_id=current_user.id, post_id=post_id, content=content)
     db.session.add(comment)
     db.session.commit()
+    response_cache.invalidate(post_comments_namespace(post_id))
+    publish_counts(post_id, comments=counts.comment_count)
 
     return jsonify({
         "message": "Comment added",
+        "comments": counts.comment_count,
         "comment": {
             "id": comment.id,
             "user_id": comment.user_id,
@@ -102,47 +125,79 @@ def add_comment(current_user, post_id):
 # Get all comments for a post
 @user_posts_bp.route("/<int:post_id>/comments", methods=["GET"])
 @token_required
+@read_only
 def get_comments(current_user, post_id):
-    comments = Comment.query.filter_by(post_id=post_id).order_by(Comment.created_at.asc()).all()
-    
-    result = []
-    for c in comments:
-        user = User.query.get(c.user_id)  # <-- GET COMMENTER NAME
-        result.append({
-            "id": c.id,
-            "user_id": c.user_id,
-            "user_name": user.name if user else "Unknown",  # <-- ADDED
-            "post_id": c.post_id,
-            "content": c.content,
-            "created_at": c.created_at
-        })
-
-    return jsonify({"comments": result}), 200
+    payload = response_cache.get_or_build(
+        post_comments_namespace(post_id),
+        request_cache_key(),
+        lambda: _comments_page(post_id)
+    )
+    return jsonify(payload), 200
+
+
+def _comments_page(post_id):
+    comments, next_cursor = keyset_paginate(
+        db.session.query(*columns(COMMENT_FIELDS))
+        .select_from(Comment)
+        .outerjoin(User, User.id == Comment.user_id)
+        .filter(Comment.post_id == post_id),
+        (Comment.created_at, Comment.id),
+        descending=False
+    )
+    return {"comments": row_dicts(comments, COMMENT_FIELDS), "next_cursor": next_cursor}
+
 
 # GET all community posts with poster's name, likes count, comments count, and user's like status
 @user_posts_bp.route("/all", methods=["GET"])
 @token_required
+@read_only
 def get_all_posts(current_user):
-    posts = Post.query.order_by(Post.created_at.desc()).all()
-    result = []
-
-    for p in posts:
-        user = User.query.get(p.user_id)
-        likes_count = Like.query.filter_by(post_id=p.id).count()
-        liked_by_user = Like.query.filter_by(post_id=p.id, user_id=current_user.id).first() is not None
-
-        comments_count = Comment.query.filter_by(post_id=p.id).count()  # <-- ADDED
-
-        result.append({
-            "id": p.id,
-            "user_id": p.user_id,
-            "user_name": user.name if user else "Unknown",
-            "content": p.content,
-            "image_url": p.image_url,
-            "created_at": p.created_at,
-            "likes": likes_count,
-            "comments": comments_count,              # <-- ADDED
-            "liked_by_current_user": liked_by_user
-        })
-
-    return jsonify({"posts": result}), 200
+    rows, next_cursor = keyset_paginate(
+        community_feed_query(current_user.id),
+        (Post.created_at, Post.id)
+    )
+    return jsonify({"posts": row_dicts(rows, FEED_FIELDS), "next_cursor": next_cursor}), 200
+
+
+# Short-lived credential for opening the live feed, see create_stream_ticket
+@user_posts_bp.route("/stream-ticket", methods=["POST"])
+@token_required
+def stream_ticket(current_user):
+    return jsonify({
+        "ticket": create_stream_ticket(current_user.id),
+        "expires_in": current_app.config["STREAM_TICKET_TTL"]
+    }), 201
+
+
+# Live feed: new posts, deletions and like/comment counts as Server-Sent
+# Events. It authenticates with ?ticket= from /stream-ticket, which keeps the
+# login token out of URLs; an expired ticket gets a 401, the client's cue to
+# fetch a new one. A reconnect resumes from the Last-Event-ID header, or
+# ?last_event_id=. Streams are capped per process
+# (EVENT_STREAM_MAX_CONNECTIONS); over the cap the client gets a 503 with
+# Retry-After and backs off.
+@user_posts_bp.route("/stream", methods=["GET"])
+@stream_token_required
+def stream_feed(current_user):
+    if not stream_slots.acquire():
+        return jsonify({"error": "Live updates are unavailable"}), 503, {"Retry-After": "30"}
+
+    last_id = (
+        request.headers.get("Last-Event-ID")
+        or request.args.get("last_event_id")
+        or latest_event_id()
+    )
+    # don't hold a pooled connection for the life of the stream
+    db.session.close()
+    response = Response(
+        stream_with_context(event_stream(
+            last_id,
+            keepalive=current_app.config["EVENT_STREAM_KEEPALIVE"],
+            max_age=current_app.config["EVENT_STREAM_MAX_AGE"],
+        )),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # runs when the stream ends or the client goes away
+    response.call_on_close(stream_slots.release)
+    return response
@@ -1,9 +1,9 @@
-from flask import Blueprint, request, jsonify
-from app.utils.jwt_utils import token_required
+from flask import Blueprint, request, jsonify, url_for
+from app.utils.jwt_utils import token_required, invalidate_principal
 from app import db
 from app.models.user import User
-from werkzeug.utils import secure_filename
-import os
+from app.utils.media import store_upload, release_media, get_media_root
+from app.utils.images import schedule_variants, image_variants
 
 user_profile_bp = Blueprint("user_profile", __name__)
 
@@ -18,7 +18,8 @@ def get_profile(current_user):
         "name": current_user.name,
         "email": current_user.email,
         "is_admin": current_user.is_admin,
-        "profile_image_url": current_user.profile_image_url  # return saved image
+        "profile_image_url": current_user.profile_image_url,  # return saved image
+        "profile_image_variants": image_variants(current_user.profile_image_url, get_media_root())
     }), 200
 
 
@@ -38,6 +39,7 @@ def update_profile(current_user):
         current_user.email = data["email"]
 
         db.session.commit()
+        invalidate_principal(current_user.id)
 
         return jsonify({"message": "Profile updated successfully"}), 200
 
@@ -63,17 +65,20 @@ def upload_profile_image(current_user):
     if image.filename == "":
         return jsonify({"message": "Invalid file"}), 400
 
-    filename = secure_filename(image.filename)
-
-    # Save inside static/uploads/profile_images so Flask can serve it
-    upload_folder = os.path.join("app", "static", "uploads", "profile_images")
-    os.makedirs(upload_folder, exist_ok=True)
-    filepath = os.path.join(upload_folder, filename)
-    image.save(filepath)
+    # Stored once under its content hash; drop the reference to the old image
+    filename = store_upload(image)
+    relative_url = url_for("serve_media", filename=filename)
+    release_media(current_user.profile_image_url)
 
     # Save URL in database and commit
-    relative_url = f"/static/uploads/profile_images/{filename}"  # <- important fix
     current_user.profile_image_url = relative_url
     db.session.commit()
+    invalidate_principal(current_user.id)
+
+    media_root = get_media_root()
+    schedule_variants(media_root, filename)
 
-    return jsonify({"image_url": relative_url}), 200
+    return jsonify({
+        "image_url": relative_url,
+        "image_variants": image_variants(relative_url, media_root)
+    }), 200
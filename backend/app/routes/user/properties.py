@@ -1,9 +1,16 @@
-from flask import Blueprint, request, jsonify, current_app, url_for
+from flask import Blueprint, request, jsonify, url_for
 from app.utils.jwt_utils import token_required
+from app.utils.replicas import read_only
+from app.utils.pagination import keyset_paginate
+from app.utils.cache import response_cache, request_cache_key, APPROVED_PROPERTIES
+from app.utils.stats import bump_stats, property_status_deltas
+from app.utils.search import search_query, sync_property_index
+from app.utils.property_filters import parse_listing_filters, filtered_listings, listing_facets
 from app.models.property import Property
+from app.utils.media import store_upload, get_media_root
+from app.utils.images import schedule_variants
+from app.utils.serializers import columns, property_dict, property_dicts, PROPERTY_FIELDS
 from app import db
-import os
-from werkzeug.utils import secure_filename
 
 user_properties_bp = Blueprint("user_properties", __name__)
 
@@ -14,13 +21,6 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-# Return absolute path to upload folder and ensure it exists
-def get_upload_folder():
-    upload_path = os.path.join(current_app.root_path, "static", "uploads", "properties")
-    os.makedirs(upload_path, exist_ok=True)
-    return upload_path
-
-
 @user_properties_bp.route("/add", methods=["POST"])
 @token_required
 def add_property(current_user):
@@ -34,18 +34,11 @@ def add_property(current_user):
 
     # Handle file upload
     image_url = None
+    filename = None
     file = request.files.get("image")
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        save_path = os.path.join(get_upload_folder(), filename)
-        file.save(save_path)
-        image_url = url_for(
-    'serve_property_image',  # Use the fallback route function name
-    filename=filename,
-    _external=True
-)
-
-        print("IMAGE URL SAVED:", image_url)
+        filename = store_upload(file)
+        image_url = url_for("serve_media", filename=filename, _external=True)
 
     prop = Property(
         user_id=current_user.id,
@@ -57,61 +50,86 @@ def add_property(current_user):
     )
 
     db.session.add(prop)
+    bump_stats(**property_status_deltas(None, "pending", total=1))
+    db.session.flush()
+    sync_property_index(prop)
     db.session.commit()
+    response_cache.invalidate(APPROVED_PROPERTIES)
+
+    if filename:
+        schedule_variants(get_media_root(), filename)
 
     return jsonify({
         "message": "Property added successfully",
-        "property": {
-            "id": prop.id,
-            "user_id": prop.user_id,
-            "title": prop.title,
-            "description": prop.description,
-            "price": prop.price,
-            "status": prop.status,
-            "created_at": prop.created_at,
-            "image_url": prop.image_url,
-            "listingType": getattr(prop, "listingType", None)
-        }
+        "property": property_dict(prop, get_media_root())
     }), 201
 
 
+# Approved listings, optionally filtered by min_price / max_price /
+# listing_type and ordered by sort=newest|oldest|price_asc|price_desc.
+# Facet counts for the filtered set come back in the same response.
 @user_properties_bp.route("/all", methods=["GET"])
 @token_required
+@read_only
 def get_all_properties(current_user):
-    properties = Property.query.filter_by(status="approved").order_by(Property.created_at.desc()).all()
+    try:
+        filters = parse_listing_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Same approved list for every user: served from the response cache,
+    # invalidated by add_property and the admin moderation routes
+    payload = response_cache.get_or_build(
+        APPROVED_PROPERTIES, request_cache_key(), lambda: _approved_properties_page(filters)
+    )
+    return jsonify(payload), 200
+
+
+def _approved_properties_page(filters):
+    query, sort_columns, descending = filtered_listings(filters)
+    properties, next_cursor = keyset_paginate(
+        query.with_entities(*columns(PROPERTY_FIELDS)), sort_columns, descending=descending
+    )
+    return {
+        "properties": property_dicts(properties, get_media_root()),
+        "next_cursor": next_cursor,
+        "facets": listing_facets(filters)
+    }
+
+
+# Full-text search over approved listings, best match first; every word is
+# prefix-matched ("mod apa" finds "Modern apartment")
+@user_properties_bp.route("/search", methods=["GET"])
+@token_required
+@read_only
+def search_properties(current_user):
+    search = search_query(request.args.get("q", ""))
+    if search is None:
+        return jsonify({"error": "Search query is required"}), 400
+
+    query, sort_columns = search
+    rank = sort_columns[0]
+    rows, next_cursor = keyset_paginate(
+        query.with_entities(*columns(PROPERTY_FIELDS), rank.label("rank")),
+        sort_columns,
+        descending=False,
+        key=lambda row: (row.rank, row.id)
+    )
     return jsonify({
-        "properties": [
-            {
-                "id": p.id,
-                "user_id": p.user_id,
-                "title": p.title,
-                "description": p.description,
-                "price": p.price,
-                "status": p.status,
-                "created_at": p.created_at,
-                "image_url": p.image_url,
-                "listingType": getattr(p, "listingType", None)
-            } for p in properties
-        ]
+        "properties": property_dicts(rows, get_media_root()),
+        "next_cursor": next_cursor
     }), 200
 
 
 @user_properties_bp.route("/my-properties", methods=["GET"])
 @token_required
+@read_only
 def my_properties(current_user):
-    properties = Property.query.filter_by(user_id=current_user.id).order_by(Property.created_at.desc()).all()
+    properties, next_cursor = keyset_paginate(
+        db.session.query(*columns(PROPERTY_FIELDS)).filter(Property.user_id == current_user.id),
+        (Property.created_at, Property.id)
+    )
     return jsonify({
-        "properties": [
-            {
-                "id": p.id,
-                "user_id": p.user_id,
-                "title": p.title,
-                "description": p.description,
-                "price": p.price,
-                "status": p.status,
-                "created_at": p.created_at,
-                "image_url": p.image_url,
-                "listingType": getattr(p, "listingType", None)
-            } for p in properties
-        ]
+        "properties": property_dicts(properties, get_media_root()),
+        "next_cursor": next_cursor
     }), 200
@@ -0,0 +1,247 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from app.utils.json_provider import isoformat
+
+
+# ------------------------------------------------
+# BOUNDED TTL / LRU CACHE
+# ------------------------------------------------
+class TTLCache:
+    """Thread-safe in-process cache bounded by size (LRU eviction) and by
+    age. ``ttl`` is the default lifetime in seconds; ``set`` can override it
+    per entry. Hit/miss/eviction counters are kept for monitoring."""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# ------------------------------------------------
+# RESPONSE CACHE BACKENDS
+# ------------------------------------------------
+class LocalCacheBackend:
+    """In-process LRU; the default, and the stand-in for a shared backend."""
+
+    def __init__(self, maxsize):
+        self._cache = TTLCache(maxsize=maxsize)
+        # counters (namespace generations) must never be evicted, or stale
+        # entries from an old generation could become visible again
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._cache.set(key, value, ttl=ttl)
+
+    def get_counter(self, key):
+        return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def stats(self):
+        return self._cache.stats()
+
+
+def _json_default(o):
+    # same ISO datetimes the JSON provider writes
+    return isoformat(o) if hasattr(o, "isoformat") else str(o)
+
+
+class RedisCacheBackend:
+    """Shared backend so every worker sees the same entries and the same
+    invalidations. Values are stored as JSON."""
+
+    def __init__(self, url, prefix="dacity:"):
+        import redis  # optional dependency, only needed for this backend
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self._redis.get(self._prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self._redis.set(self._prefix + key, json.dumps(value, default=_json_default), ex=int(ttl) if ttl else None)
+
+    def get_counter(self, key):
+        return int(self._redis.get(self._prefix + key) or 0)
+
+    def incr(self, key):
+        return self._redis.incr(self._prefix + key)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ------------------------------------------------
+# RESPONSE CACHE
+# ------------------------------------------------
+class ResponseCache:
+    """Cache for user-independent response payloads.
+
+    Entries live under a namespace; ``invalidate(namespace)`` bumps the
+    namespace's generation so every key built under the old one is ignored.
+    Misses are single-flight per process: concurrent requests for the same
+    key wait for one rebuild instead of all running the query.
+    """
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self.rebuilds = 0
+
+    def generation(self, namespace):
+        """Current generation of ``namespace``; changes on ``invalidate``."""
+        return self.backend.get_counter(f"gen:{namespace}")
+
+    def _key(self, namespace, key):
+        return f"{namespace}:{self.generation(namespace)}:{key}"
+
+    def _acquire_slot(self, full_key):
+        with self._locks_lock:
+            slot = self._locks.get(full_key)
+            if slot is None:
+                slot = self._locks[full_key] = [threading.Lock(), 0]
+            slot[1] += 1
+            return slot
+
+    def _release_slot(self, full_key, slot):
+        with self._locks_lock:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._locks[full_key]
+
+    def get_or_build(self, namespace, key, builder):
+        full_key = self._key(namespace, key)
+        value = self.backend.get(full_key)
+        if value is not None:
+            return value
+
+        slot = self._acquire_slot(full_key)
+        try:
+            with slot[0]:
+                value = self.backend.get(full_key)
+                if value is None:
+                    # cached payloads outlive replica lag, so build from the primary
+                    from app.utils.replicas import primary_reads
+                    with primary_reads():
+                        value = builder()
+                    self.rebuilds += 1
+                    self.backend.set(full_key, value, ttl=self.ttl)
+                return value
+        finally:
+            self._release_slot(full_key, slot)
+
+    def invalidate(self, namespace):
+        self.backend.incr(f"gen:{namespace}")
+
+    def stats(self):
+        return dict(self.backend.stats(), rebuilds=self.rebuilds)
+
+
+# in-process until init_response_cache applies the app config in create_app;
+# modules import this object, so it is reconfigured rather than replaced
+response_cache = ResponseCache(LocalCacheBackend(maxsize=512), ttl=60)
+
+
+def init_response_cache(app):
+    config = app.config
+    if config["RESPONSE_CACHE_BACKEND"] == "redis":
+        backend = RedisCacheBackend(config["RESPONSE_CACHE_URL"])
+    else:
+        backend = LocalCacheBackend(maxsize=config["RESPONSE_CACHE_SIZE"])
+    response_cache.backend = backend
+    response_cache.ttl = config["RESPONSE_CACHE_TTL"]
+
+# Namespaces, so writers invalidate exactly what readers cached
+APPROVED_PROPERTIES = "properties:approved"
+
+
+def post_comments_namespace(post_id):
+    return f"comments:{post_id}"
+
+
+def principal_namespace(user_id):
+    return f"principal:{user_id}"
+
+
+def request_cache_key():
+    """Cache key for the current request's query string (cursor, limit, ...)."""
+    from flask import request
+    from urllib.parse import urlencode
+
+    return urlencode(sorted(request.args.items(multi=True)))
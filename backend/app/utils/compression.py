@@ -0,0 +1,166 @@
+import gzip
+import threading
+import time
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+
+# ------------------------------------------------
+# METRICS
+# ------------------------------------------------
+class CompressionStats:
+    """Per-encoding totals since startup: responses, bytes before and after,
+    and time spent compressing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, encoding, bytes_in, bytes_out, seconds):
+        with self._lock:
+            totals = self._totals.setdefault(
+                encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0}
+            )
+            totals["responses"] += 1
+            totals["bytes_in"] += bytes_in
+            totals["bytes_out"] += bytes_out
+            totals["seconds"] += seconds
+
+    def stats(self):
+        with self._lock:
+            result = {}
+            for encoding, totals in self._totals.items():
+                result[encoding] = dict(
+                    totals,
+                    seconds=round(totals["seconds"], 4),
+                    ratio=round(totals["bytes_out"] / totals["bytes_in"], 4) if totals["bytes_in"] else 0.0,
+                )
+            return result
+
+
+compression_stats = CompressionStats()
+
+
+# ------------------------------------------------
+# COMPRESSORS
+# ------------------------------------------------
+def _compressor(encoding, level):
+    """Object with ``compress(chunk)`` and ``finish()`` returning bytes."""
+    if encoding == "br":
+        return _BrotliCompressor(level)
+    return _GzipCompressor(level)
+
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk):
+        # Z_SYNC_FLUSH so each streamed chunk reaches the client promptly
+        return self._z.compress(chunk) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._z.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, level):
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._c.process(chunk) + self._c.flush()
+
+    def finish(self):
+        return self._c.finish()
+
+
+def _compress_body(encoding, data, level):
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+# ------------------------------------------------
+# RESPONSE HOOK
+# ------------------------------------------------
+def _should_skip(response, config):
+    if request.method == "HEAD" or response.status_code < 200 or response.status_code in (204, 206, 304):
+        return True
+    # send_file responses (uploads) are handed to the server as files
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return True
+    # SSE must reach the client event by event
+    if response.mimetype == "text/event-stream":
+        return True
+    return response.mimetype not in config["COMPRESS_MIMETYPES"]
+
+
+def _choose_encoding(config):
+    offered = [e for e in config["COMPRESS_ALGORITHMS"] if e != "br" or brotli is not None]
+    return request.accept_encodings.best_match(offered) if offered else None
+
+
+def _set_etag(response, encoding):
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+
+
+def _stream(chunks, compressor, encoding):
+    bytes_in = bytes_out = 0
+    seconds = 0.0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        started = time.perf_counter()
+        out = compressor.compress(chunk)
+        seconds += time.perf_counter() - started
+        bytes_in += len(chunk)
+        bytes_out += len(out)
+        if out:
+            yield out
+    tail = compressor.finish()
+    compression_stats.record(encoding, bytes_in, bytes_out + len(tail), seconds)
+    yield tail
+
+
+def compress_response(response):
+    """after_request hook: gzip / brotli the body when the client accepts
+    it, the type is on COMPRESS_MIMETYPES and it is at least
+    COMPRESS_MIN_SIZE bytes. Streamed bodies are compressed chunk by chunk."""
+    from flask import current_app
+
+    config = current_app.config
+    if _should_skip(response, config):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    encoding = _choose_encoding(config)
+    if not encoding:
+        return response
+    level = config["COMPRESS_BROTLI_QUALITY"] if encoding == "br" else config["COMPRESS_LEVEL"]
+
+    if response.is_streamed:
+        response.response = _stream(response.response, _compressor(encoding, level), encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+        started = time.perf_counter()
+        compressed = _compress_body(encoding, data, level)
+        compression_stats.record(encoding, len(data), len(compressed), time.perf_counter() - started)
+        response.set_data(compressed)
+
+    response.headers["Content-Encoding"] = encoding
+    _set_etag(response, encoding)
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -0,0 +1,123 @@
+from datetime import datetime
+from sqlalchemy import delete, func, literal, or_, select, update
+from app import db
+from app.models.post import Post
+from app.models.like import Like
+from app.models.comment import Comment
+from app.utils.sql import dialect_insert
+
+
+# ------------------------------------------------
+# INCREMENTAL UPDATES
+# ------------------------------------------------
+def bump_post_counters(post_id, likes=0, comments=0):
+    """Adjust a post's counters in the current transaction.
+
+    The increment is done in SQL (``like_count = like_count + n``) so
+    concurrent requests never overwrite each other. Returns the updated
+    ``(like_count, comment_count)`` row, or None when the post does not
+    exist.
+    """
+    values = {}
+    if likes:
+        values[Post.like_count] = Post.like_count + likes
+    if comments:
+        values[Post.comment_count] = Post.comment_count + comments
+
+    return db.session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(values)
+        .returning(Post.like_count, Post.comment_count)
+    ).first()
+
+
+def toggle_post_like(user_id, post_id):
+    """Like or unlike a post in the current transaction and return
+    ``(liked, like_count)``, or None when the post does not exist.
+
+    Every step is a single statement whose RETURNING clause says what it
+    actually changed, so concurrent toggles (double clicks) never hit the
+    unique constraint and the counter moves only by rows really added or
+    removed.
+    """
+    unliked = db.session.execute(
+        delete(Like)
+        .where(Like.user_id == user_id, Like.post_id == post_id)
+        .returning(Like.id)
+    ).first()
+
+    if unliked:
+        liked, delta = False, -1
+    else:
+        # INSERT ... SELECT FROM post: nothing is inserted for a missing post
+        liked_row = db.session.execute(
+            dialect_insert(Like)
+            .from_select(
+                ["user_id", "post_id", "created_at"],
+                select(literal(user_id), Post.id, literal(datetime.utcnow())).where(Post.id == post_id),
+            )
+            .on_conflict_do_nothing(index_elements=[Like.user_id, Like.post_id])
+            .returning(Like.id)
+        ).first()
+        # no row: the post is gone, or a concurrent request liked it first
+        liked, delta = True, 1 if liked_row else 0
+
+    like_count = db.session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(like_count=Post.like_count + delta)
+        .returning(Post.like_count)
+    ).scalar()
+    if like_count is None:
+        return None
+    return liked, like_count
+
+
+# ------------------------------------------------
+# RECONCILIATION
+# ------------------------------------------------
+def _actual_counts():
+    likes = (
+        select(func.count(Like.id))
+        .where(Like.post_id == Post.id)
+        .scalar_subquery()
+    )
+    comments = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .scalar_subquery()
+    )
+    return likes, comments
+
+
+def find_counter_drift():
+    """Return ``(post_id, like_count, actual_likes, comment_count,
+    actual_comments)`` for every post whose stored counters are wrong."""
+    likes, comments = _actual_counts()
+    return (
+        db.session.query(Post.id, Post.like_count, likes, Post.comment_count, comments)
+        .filter(or_(Post.like_count != likes, Post.comment_count != comments))
+        .order_by(Post.id)
+        .all()
+    )
+
+
+def reconcile_post_counters(chunk_size=500):
+    """Recompute counters for drifted posts with set-based UPDATEs and
+    return the drift that was found."""
+    drift = find_counter_drift()
+    likes, comments = _actual_counts()
+    post_ids = [row[0] for row in drift]
+
+    for start in range(0, len(post_ids), chunk_size):
+        chunk = post_ids[start:start + chunk_size]
+        db.session.execute(
+            update(Post)
+            .where(Post.id.in_(chunk))
+            .values(like_count=likes, comment_count=comments)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.session.commit()
+    return drift
@@ -0,0 +1,260 @@
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, func, select
+from app import db
+from app.models.deletion_job import DeletionJob
+from app.models.user import User
+from app.models.post import Post
+from app.models.like import Like
+from app.models.comment import Comment
+from app.models.property import Property
+from app.utils.cache import response_cache, APPROVED_PROPERTIES, post_comments_namespace
+from app.utils.events import publish_post_deleted
+from app.utils.jwt_utils import invalidate_principal
+from app.utils.json_provider import isoformat
+from app.utils.media import release_media_many, collect_media_garbage
+from app.utils.search import unindex_properties
+from app.utils.stats import bump_stats, property_status_deltas
+
+logger = logging.getLogger(__name__)
+
+_executor = None   # started by init_deletion with DELETION_WORKERS threads
+
+
+def init_deletion(app):
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = ThreadPoolExecutor(max_workers=app.config["DELETION_WORKERS"], thread_name_prefix="deletion")
+
+
+# ------------------------------------------------
+# SET-BASED BUILDING BLOCKS (caller's transaction)
+# ------------------------------------------------
+def delete_post_rows(post_ids):
+    """Delete posts with every like and comment on them; returns the number
+    of rows removed. The ON DELETE CASCADE keys would do the same, but
+    explicit statements keep the row count and work on databases whose
+    constraints predate them."""
+    removed = Like.query.filter(Like.post_id.in_(post_ids)).delete(synchronize_session=False)
+    removed += Comment.query.filter(Comment.post_id.in_(post_ids)).delete(synchronize_session=False)
+    posts = Post.query.filter(Post.id.in_(post_ids)).delete(synchronize_session=False)
+    bump_stats(total_posts=-posts)
+    return removed + posts
+
+
+def delete_property_rows(rows):
+    """Delete listings given ``(id, status, image_url)`` rows, releasing
+    their images and keeping stats and the search index in step."""
+    ids = [row.id for row in rows]
+    deltas = Counter()
+    for row in rows:
+        deltas.update(property_status_deltas(row.status, None, total=-1))
+    release_media_many(row.image_url for row in rows)
+    unindex_properties(ids)
+    Property.query.filter(Property.id.in_(ids)).delete(synchronize_session=False)
+    bump_stats(**deltas)
+    return len(ids)
+
+
+def _decrement_post_counter(counter, post_ids):
+    counts = Counter(post_ids)
+    Post.query.filter(Post.id.in_(counts)).update(
+        {counter: counter - case(counts, value=Post.id, else_=0)},
+        synchronize_session=False,
+    )
+
+
+# ------------------------------------------------
+# USER DELETION
+# ------------------------------------------------
+def count_user_rows(user_ids):
+    """Rows ``delete_users`` will remove, from one query."""
+    own_posts = select(Post.id).where(Post.user_id.in_(user_ids))
+    counts = [
+        select(func.count(Post.id)).where(Post.user_id.in_(user_ids)),
+        select(func.count(Like.id)).where(Like.user_id.in_(user_ids) | Like.post_id.in_(own_posts)),
+        select(func.count(Comment.id)).where(Comment.user_id.in_(user_ids) | Comment.post_id.in_(own_posts)),
+        select(func.count(Property.id)).where(Property.user_id.in_(user_ids)),
+    ]
+    return sum(db.session.execute(select(*[c.scalar_subquery() for c in counts])).one()) + len(user_ids)
+
+
+def delete_users(user_ids, progress=None):
+    """Delete users and everything that references them.
+
+    Each chunk is a set-based ``DELETE ... WHERE ... IN (...)`` committed on
+    its own, so locks are held briefly and an interrupted run can simply be
+    started again. ``progress(n)`` is called inside each chunk's transaction
+    with the number of rows it removed. Returns the total.
+    """
+    size = current_app.config["DELETION_CHUNK_SIZE"]
+    user_ids = list(user_ids)
+    removed = 0
+    deleted_posts = []
+    stale_threads = set()
+    properties_deleted = False
+
+    def commit(count):
+        nonlocal removed
+        removed += count
+        if progress:
+            progress(count)
+        db.session.commit()
+
+    # Their posts, with every like and comment on them
+    while True:
+        post_ids = db.session.scalars(
+            select(Post.id).where(Post.user_id.in_(user_ids)).limit(size)
+        ).all()
+        if not post_ids:
+            break
+        commit(delete_post_rows(post_ids))
+        deleted_posts.extend(post_ids)
+
+    # Their likes and comments on other people's posts, taking the
+    # denormalized counters down with them
+    for model, counter in ((Like, Post.like_count), (Comment, Post.comment_count)):
+        while True:
+            rows = (
+                db.session.query(model.id, model.post_id)
+                .filter(model.user_id.in_(user_ids))
+                .limit(size)
+                .all()
+            )
+            if not rows:
+                break
+            _decrement_post_counter(counter, [row.post_id for row in rows])
+            model.query.filter(model.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+            if model is Comment:
+                stale_threads.update(row.post_id for row in rows)
+            commit(len(rows))
+
+    # Their listings
+    while True:
+        rows = (
+            db.session.query(Property.id, Property.status, Property.image_url)
+            .filter(Property.user_id.in_(user_ids))
+            .limit(size)
+            .all()
+        )
+        if not rows:
+            break
+        commit(delete_property_rows(rows))
+        properties_deleted = True
+
+    # The users themselves; anything they created since the chunks above
+    # went goes with them through ON DELETE CASCADE
+    images = db.session.scalars(
+        select(User.profile_image_url).where(User.id.in_(user_ids))
+    ).all()
+    release_media_many(images)
+    users = User.query.filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    bump_stats(total_users=-users)
+    commit(users)
+
+    for user_id in user_ids:
+        invalidate_principal(user_id)
+    for post_id in stale_threads.union(deleted_posts):
+        response_cache.invalidate(post_comments_namespace(post_id))
+    for post_id in deleted_posts:
+        publish_post_deleted(post_id)
+    if properties_deleted:
+        response_cache.invalidate(APPROVED_PROPERTIES)
+
+    # Remove the files nothing references any more
+    collect_media_garbage()
+    return removed
+
+
+# ------------------------------------------------
+# BACKGROUND JOBS
+# ------------------------------------------------
+def job_json(job):
+    return {
+        "id": job.id,
+        "user_id": job.user_id,
+        "status": job.status,
+        "total": job.total,
+        "deleted": job.deleted,
+        "error": job.error,
+        "created_at": isoformat(job.created_at) if job.created_at else None,
+        "finished_at": isoformat(job.finished_at) if job.finished_at else None
+    }
+
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def fail_stale_jobs(*criteria):
+    """Mark queued / running jobs matching ``criteria`` failed when their
+    heartbeat is older than DELETION_JOB_STALE_AFTER: the worker running
+    them is gone. ``delete_users`` commits chunk by chunk, so starting the
+    deletion again carries on where the job stopped."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=current_app.config["DELETION_JOB_STALE_AFTER"])
+    failed = DeletionJob.query.filter(
+        *criteria, DeletionJob.status.in_(ACTIVE_STATUSES), DeletionJob.updated_at < stale_before
+    ).update(
+        {"status": "failed", "error": "Interrupted: no progress from the worker", "finished_at": now},
+        synchronize_session=False,
+    )
+    if failed:
+        db.session.commit()
+    return failed
+
+
+def active_job(user_id):
+    fail_stale_jobs(DeletionJob.user_id == user_id)
+    return (
+        DeletionJob.query
+        .filter(DeletionJob.user_id == user_id, DeletionJob.status.in_(ACTIVE_STATUSES))
+        .first()
+    )
+
+
+def start_user_deletion(user_id, total):
+    """Queue ``delete_users([user_id])`` on the deletion worker and return
+    the job row tracking it."""
+    job = DeletionJob(user_id=user_id, total=total)
+    db.session.add(job)
+    db.session.commit()
+    _executor.submit(_run_job, current_app._get_current_object(), job.id)
+    return job
+
+
+def _run_job(app, job_id):
+    with app.app_context():
+        # Claim the job only if it is still queued: one that waited here
+        # past DELETION_JOB_STALE_AFTER may have been failed and restarted
+        claimed = DeletionJob.query.filter_by(id=job_id, status="queued").update(
+            {"status": "running", "updated_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.session.commit()
+        if not claimed:
+            return
+        job = db.session.get(DeletionJob, job_id)
+
+        def progress(count):
+            DeletionJob.query.filter_by(id=job_id).update(
+                {DeletionJob.deleted: DeletionJob.deleted + count, DeletionJob.updated_at: datetime.utcnow()},
+                synchronize_session=False,
+            )
+
+        try:
+            delete_users([job.user_id], progress=progress)
+            status, error = "done", None
+        except Exception as e:
+            logger.exception("Deletion job %s failed", job_id)
+            db.session.rollback()
+            status, error = "failed", str(e)
+
+        DeletionJob.query.filter_by(id=job_id).update(
+            {"status": status, "error": error, "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.session.commit()
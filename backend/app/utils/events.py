@@ -0,0 +1,203 @@
+import json
+import threading
+import time
+from collections import deque
+from app.utils.json_provider import isoformat
+
+
+# ------------------------------------------------
+# BROKERS
+# ------------------------------------------------
+# A broker keeps a bounded history of (id, type, data) events. ``read``
+# returns the events after ``last_id``, blocking up to ``timeout`` seconds
+# for one to arrive, or None when ``last_id`` has already been dropped from
+# the history and the reader has to start over. Ids are opaque strings.
+class LocalEventBroker:
+    """In-process ring buffer; the default, and the stand-in for a shared
+    broker. Only subscribers in the same process see the events."""
+
+    def __init__(self, maxlen):
+        self._events = deque(maxlen=maxlen)
+        self._next_id = 1
+        self._changed = threading.Condition()
+
+    def publish(self, event_type, data):
+        with self._changed:
+            event_id = str(self._next_id)
+            self._next_id += 1
+            self._events.append((event_id, event_type, data))
+            self._changed.notify_all()
+            return event_id
+
+    def latest_id(self):
+        with self._changed:
+            return str(self._next_id - 1)
+
+    def _after(self, last_id):
+        if last_id >= self._next_id:
+            return None  # an id from before a restart
+        if not self._events:
+            return []
+        first = int(self._events[0][0])
+        if last_id < first - 1:
+            return None
+        return list(self._events)[max(last_id - first + 1, 0):]
+
+    def read(self, last_id, timeout):
+        try:
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            return None
+        with self._changed:
+            events = self._after(last_id)
+            if events == []:
+                self._changed.wait(timeout)
+                events = self._after(last_id)
+            return events
+
+
+class RedisEventBroker:
+    """A Redis stream shared by every worker; stream entry ids are the event
+    ids, so a reconnecting client resumes on any worker."""
+
+    def __init__(self, url, maxlen, key="dacity:events"):
+        import redis  # optional dependency, only needed for this broker
+
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._maxlen = maxlen
+        self._key = key
+
+    def publish(self, event_type, data):
+        return self._redis.xadd(
+            self._key,
+            {"type": event_type, "data": json.dumps(data, default=str)},
+            maxlen=self._maxlen,
+            approximate=True,
+        )
+
+    def latest_id(self):
+        entries = self._redis.xrevrange(self._key, count=1)
+        return entries[0][0] if entries else "0-0"
+
+    def read(self, last_id, timeout):
+        oldest = self._redis.xrange(self._key, count=1)
+        if oldest and _stream_id(oldest[0][0]) > _stream_id(last_id) and last_id != "0-0":
+            return None  # entries after last_id may have been trimmed
+        result = self._redis.xread({self._key: last_id}, block=int(timeout * 1000), count=100)
+        if not result:
+            return []
+        return [
+            (entry_id, fields["type"], json.loads(fields["data"]))
+            for entry_id, fields in result[0][1]
+        ]
+
+
+def _stream_id(entry_id):
+    try:
+        ms, _, seq = str(entry_id).partition("-")
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return (0, 0)
+
+
+def _build_broker(config):
+    if config["EVENT_BROKER_BACKEND"] == "redis":
+        return RedisEventBroker(config["EVENT_BROKER_URL"], maxlen=config["EVENT_BUFFER_SIZE"])
+    return LocalEventBroker(maxlen=config["EVENT_BUFFER_SIZE"])
+
+
+# replaced by init_events in create_app with the one the app config asks for
+broker = LocalEventBroker(maxlen=1000)
+
+
+# ------------------------------------------------
+# STREAM SLOTS
+# ------------------------------------------------
+class StreamSlots:
+    """Caps the streams open in this process. Each stream holds a thread
+    (or, under gevent, a greenlet) until it ends, so on thread workers an
+    uncapped number of streams would leave no threads for the API."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.limit is not None and self.active >= self.limit:
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
+# limit set by init_events from EVENT_STREAM_MAX_CONNECTIONS
+stream_slots = StreamSlots(None)
+
+
+def init_events(app):
+    global broker
+    broker = _build_broker(app.config)
+    stream_slots.limit = app.config["EVENT_STREAM_MAX_CONNECTIONS"]
+
+
+# ------------------------------------------------
+# FEED EVENTS
+# ------------------------------------------------
+# Published by the post routes after their commit, so subscribers only ever
+# see committed changes. Counts are absolute, so replaying an event is harmless.
+def publish_post_created(post, user_name):
+    broker.publish("post", {
+        "id": post.id,
+        "user_id": post.user_id,
+        "user_name": user_name,
+        "content": post.content,
+        "image_url": post.image_url,
+        "created_at": isoformat(post.created_at),
+        "likes": 0,
+        "comments": 0
+    })
+
+
+def publish_post_deleted(post_id):
+    broker.publish("post_deleted", {"id": post_id})
+
+
+def publish_counts(post_id, **counts):
+    """e.g. ``publish_counts(7, likes=3)``"""
+    broker.publish("counts", dict(counts, post_id=post_id))
+
+
+def latest_event_id():
+    """Where a stream without Last-Event-ID starts."""
+    return broker.latest_id()
+
+
+# ------------------------------------------------
+# SERVER-SENT EVENTS
+# ------------------------------------------------
+def format_event(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def event_stream(last_id, keepalive, max_age):
+    """SSE body: events after ``last_id`` as they are published, a comment
+    line every ``keepalive`` seconds of silence, and a ``reset`` event if
+    the client fell too far behind to resume. Ends after ``max_age``
+    seconds; EventSource reconnects with Last-Event-ID."""
+    deadline = time.monotonic() + max_age
+    yield f"retry: 3000\nid: {last_id}\n\n"
+    while time.monotonic() < deadline:
+        events = broker.read(last_id, timeout=keepalive)
+        if events is None:
+            last_id = broker.latest_id()
+            yield format_event(last_id, "reset", {})
+        elif not events:
+            yield ": keepalive\n\n"
+        for event_id, event_type, data in events or ():
+            last_id = event_id
+            yield format_event(event_id, event_type, data)
@@ -0,0 +1,46 @@
+from sqlalchemy import and_
+from sqlalchemy.orm import aliased
+from app import db
+from app.models.post import Post
+from app.models.user import User
+from app.models.like import Like
+from app.utils.serializers import AUTHOR_NAME, columns
+
+
+# ------------------------------------------------
+# COMMUNITY FEED QUERY
+# ------------------------------------------------
+viewer_like = aliased(Like, name="viewer_like")
+
+FEED_FIELDS = {
+    "id": Post.id,
+    "user_id": Post.user_id,
+    "user_name": AUTHOR_NAME,
+    "content": Post.content,
+    "image_url": Post.image_url,
+    "created_at": Post.created_at,
+    "likes": Post.like_count,
+    "comments": Post.comment_count,
+    "liked_by_current_user": viewer_like.id.isnot(None),
+}
+
+
+def community_feed_query(viewer_id):
+    """Return a query yielding one ``FEED_FIELDS`` row per post with its
+    author name, like/comment counts and whether ``viewer_id`` liked it.
+
+    Counts are read from the denormalized ``Post.like_count`` /
+    ``Post.comment_count`` columns and the viewer's like is a single indexed
+    outer join, so the feed is one statement no matter how many posts are
+    returned.
+    """
+    return (
+        db.session.query(*columns(FEED_FIELDS))
+        .select_from(Post)
+        .outerjoin(User, User.id == Post.user_id)
+        .outerjoin(
+            viewer_like,
+            and_(viewer_like.post_id == Post.id, viewer_like.user_id == viewer_id),
+        )
+        .order_by(Post.created_at.desc(), Post.id.desc())
+    )
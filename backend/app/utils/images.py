@@ -0,0 +1,117 @@
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.media import FILE_MODE, MEDIA_URL_RE
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it only originals are served
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# name -> longest edge in pixels
+VARIANTS = {"thumb": 160, "card": 640, "full": 1600}
+FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+
+_executor = None   # started by init_images with IMAGE_WORKERS threads
+_ready = set()   # variant paths known to exist, to skip the stat on reads
+
+
+def init_images(app):
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = ThreadPoolExecutor(max_workers=app.config["IMAGE_WORKERS"], thread_name_prefix="image-variants")
+
+
+# ------------------------------------------------
+# NAMING
+# ------------------------------------------------
+def variant_filename(digest, variant, fmt):
+    return f"{digest}_{variant}.{fmt}"
+
+
+def _variant_path(media_root, digest, variant, fmt):
+    return os.path.join(media_root, digest[:2], variant_filename(digest, variant, fmt))
+
+
+# ------------------------------------------------
+# GENERATION (runs on the worker pool)
+# ------------------------------------------------
+def _save_atomically(image, path, pil_format):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".variant-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            os.fchmod(fd, FILE_MODE)
+            image.save(tmp, pil_format, quality=82, optimize=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def generate_variants(media_root, filename):
+    """Write every size/format variant of a stored image that is missing."""
+    digest, extension = filename.rsplit(".", 1)
+    source = os.path.join(media_root, digest[:2], filename)
+
+    with Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        for variant, edge in VARIANTS.items():
+            resized = original.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+            for fmt, pil_format in FORMATS.items():
+                path = _variant_path(media_root, digest, variant, fmt)
+                if os.path.exists(path):
+                    continue
+                out = resized
+                if pil_format == "JPEG" and out.mode not in ("RGB", "L"):
+                    out = out.convert("RGB")
+                _save_atomically(out, path, pil_format)
+                _ready.add(path)
+
+
+def _generate_logged(media_root, filename):
+    try:
+        generate_variants(media_root, filename)
+    except Exception:
+        logger.exception("Failed to generate image variants for %s", filename)
+
+
+def schedule_variants(media_root, filename):
+    """Queue variant generation for a stored image, off the request path."""
+    if Image is None or filename.rsplit(".", 1)[-1] not in IMAGE_EXTENSIONS:
+        return None
+    return _executor.submit(_generate_logged, media_root, filename)
+
+
+# ------------------------------------------------
+# URLS FOR LISTINGS
+# ------------------------------------------------
+def image_variants(image_url, media_root):
+    """Map each variant to ``{"webp": url, "jpeg": url}``. Variants that
+    are not generated yet point at the original image."""
+    if not image_url:
+        return None
+
+    match = MEDIA_URL_RE.search(image_url)
+    if not match:
+        return {variant: {fmt: image_url for fmt in FORMATS} for variant in VARIANTS}
+
+    digest = match.group(1)
+    prefix = image_url[:match.start()] + "/uploads/media/"
+    result = {}
+    for variant in VARIANTS:
+        result[variant] = {}
+        for fmt in FORMATS:
+            path = _variant_path(media_root, digest, variant, fmt)
+            if path in _ready or os.path.exists(path):
+                _ready.add(path)
+                result[variant][fmt] = prefix + variant_filename(digest, variant, fmt)
+            else:
+                result[variant][fmt] = image_url
+    return result
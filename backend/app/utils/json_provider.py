@@ -0,0 +1,72 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+    orjson = None
+
+
+def isoformat(o):
+    """ISO 8601 for a date or datetime. The database stores naive UTC, so a
+    naive datetime gets an explicit UTC offset; browsers would otherwise
+    parse it as local time."""
+    if isinstance(o, datetime) and o.tzinfo is None:
+        o = o.replace(tzinfo=timezone.utc)
+    return o.isoformat()
+
+
+def _default(o):
+    # datetimes / dates as ISO 8601 everywhere (Flask's default is an HTTP date)
+    if isinstance(o, date):
+        return isoformat(o)
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson when it is installed.
+
+    orjson writes UTF-8 bytes straight into the response and handles
+    datetime natively (naive ones as UTC, with a "Z"); keys are left in
+    insertion order instead of being sorted. Without orjson the stdlib
+    encoder is used with the same ISO datetime handling.
+    """
+
+    default = staticmethod(_default)
+    sort_keys = False
+    ensure_ascii = False
+
+    def _orjson_option(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        return option | orjson.OPT_INDENT_2 if indent else option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._orjson_option()).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._orjson_option(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -1,9 +1,30 @@
 import datetime
+import hashlib
+import time
 import jwt
-from flask import request, jsonify
+from flask import current_app, g, request, jsonify
 from functools import wraps
-from app.config import Config
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
 from app.models.user import User
+from app.utils.cache import TTLCache, principal_namespace, response_cache
+
+# token hash -> user id, kept until the token's own exp
+_token_cache = TTLCache(maxsize=4096)
+# user id -> (generation, column values of the User row). The rows are
+# per process; the generation lives in the response cache backend, so an
+# invalidate_principal in one worker reaches all of them when that backend
+# is shared (RESPONSE_CACHE_BACKEND=redis)
+_principal_cache = TTLCache(maxsize=1024, ttl=60)
+
+
+def init_auth_caches(app):
+    """Size the caches above from the app config (called by create_app)."""
+    global _token_cache, _principal_cache
+    _token_cache = TTLCache(maxsize=app.config["TOKEN_CACHE_SIZE"])
+    _principal_cache = TTLCache(
+        maxsize=app.config["PRINCIPAL_CACHE_SIZE"], ttl=app.config["PRINCIPAL_CACHE_TTL"]
+    )
 
 # ------------------------------------------------
 # CREATE TOKEN (already exists)
@@ -14,33 +35,129 @@ def create_token(user_id):
         "exp": datetime.datetime.utcnow() + datetime.timedelta(days=7)
     }
 
-    return jwt.encode(payload, Config.SECRET_KEY, algorithm="HS256")
+    return jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
+
+
+# ------------------------------------------------
+# STREAM TICKETS
+# ------------------------------------------------
+# EventSource can't send headers, so the live feed takes its credential in
+# the URL. A ticket is a short-lived token that only opens streams, so what
+# ends up in proxy logs and browser history expires in STREAM_TICKET_TTL.
+def create_stream_ticket(user_id):
+    payload = {
+        "id": user_id,
+        "scope": "stream",
+        "exp": datetime.datetime.utcnow() + datetime.timedelta(seconds=current_app.config["STREAM_TICKET_TTL"])
+    }
+    return jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
+
+
+def _decode_stream_ticket(ticket):
+    decoded = jwt.decode(ticket, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    if decoded.get("scope") != "stream":
+        raise jwt.InvalidTokenError("Not a stream ticket")
+    return decoded["id"]
+
+
+# ------------------------------------------------
+# TOKEN / PRINCIPAL CACHES
+# ------------------------------------------------
+def _decode_token(token):
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    user_id = _token_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    decoded = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    if "scope" in decoded:
+        # stream tickets only open streams
+        raise jwt.InvalidTokenError("Scoped token")
+    user_id = decoded["id"]
+    remaining = decoded["exp"] - time.time()
+    if remaining > 0:
+        _token_cache.set(key, user_id, ttl=remaining)
+    return user_id
+
+
+def _load_principal(user_id):
+    generation = response_cache.generation(principal_namespace(user_id))
+    cached = _principal_cache.get(user_id)
+    if cached is not None and cached[0] == generation:
+        # Rebuild the row as a detached instance and attach it without a
+        # SELECT; routes can still modify and commit it as usual.
+        user = User(**cached[1])
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = User.query.get(user_id)
+    if user is not None:
+        _principal_cache.set(user_id, (generation, {
+            column.key: getattr(user, column.key) for column in User.__table__.columns
+        }))
+    return user
+
+
+def invalidate_principal(user_id):
+    """Drop a cached user row in every worker; call after committing a
+    change to it."""
+    _principal_cache.delete(user_id)
+    response_cache.invalidate(principal_namespace(user_id))
+
+
+def principal_cache_stats():
+    return {
+        "principals": _principal_cache.stats(),
+        "tokens": _token_cache.stats(),
+    }
 
 
 # ------------------------------------------------
 # TOKEN REQUIRED DECORATOR
 # ------------------------------------------------
+def _authenticate(f, token, args, kwargs, decode=_decode_token):
+    if not token:
+        return jsonify({"error": "Token missing"}), 401
+
+    try:
+        user_id = decode(token)
+        current_user = _load_principal(user_id)
+    except Exception:
+        return jsonify({"error": "Invalid or expired token"}), 401
+
+    if current_user is None:
+        return jsonify({"error": "Invalid or expired token"}), 401
+
+    # read-your-writes for replica routing (app/utils/replicas.py)
+    g.current_user_id = current_user.id
+    return f(current_user, *args, **kwargs)
+
+
+def _bearer_token():
+    # Token comes from Authorization header: Bearer <token>
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    return None
+
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-
-        # Token comes from Authorization header: Bearer <token>
-        if "Authorization" in request.headers:
-            auth_header = request.headers["Authorization"]
-            if auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
+        return _authenticate(f, _bearer_token(), args, kwargs)
 
-        if not token:
-            return jsonify({"error": "Token missing"}), 401    
+    return decorated
 
-        try:
-            decoded = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
-            current_user = User.query.get(decoded["id"])
-        except Exception:
-            return jsonify({"error": "Invalid or expired token"}), 401
 
-        return f(current_user, *args, **kwargs)
+def stream_token_required(f):
+    """``token_required`` that also accepts a stream ticket as ``?ticket=``,
+    for EventSource streams (browsers can't set headers on them)."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = _bearer_token()
+        if token:
+            return _authenticate(f, token, args, kwargs)
+        return _authenticate(f, request.args.get("ticket"), args, kwargs, decode=_decode_stream_ticket)
 
     return decorated
 
@@ -0,0 +1,209 @@
+import fcntl
+import hashlib
+import os
+import re
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import case
+from werkzeug.utils import secure_filename
+from app import db
+from app.models.media import MediaBlob
+from app.utils.metrics import record_upload
+from app.utils.sql import dialect_insert
+
+CHUNK_SIZE = 64 * 1024
+# mkstemp creates 0600 files; stored media must be readable by the web
+# server (nginx static / X-Accel-Redirect) running as another user
+FILE_MODE = 0o644
+
+# Matches both relative (/uploads/media/...) and absolute media URLs
+MEDIA_URL_RE = re.compile(r"/uploads/media/([0-9a-f]{64})\.([a-z0-9]+)$")
+
+
+# ------------------------------------------------
+# PATHS
+# ------------------------------------------------
+def get_media_root():
+    media_root = os.path.join(current_app.static_folder, "uploads", "media")
+    os.makedirs(media_root, exist_ok=True)
+    return media_root
+
+
+def media_path(filename):
+    """Absolute path of a stored media file; files are sharded by the first
+    two hex digits of their digest."""
+    return os.path.join(get_media_root(), filename[:2], filename)
+
+
+def parse_media_url(url):
+    """Return ``(digest, extension)`` for a media store URL, else None."""
+    match = MEDIA_URL_RE.search(url or "")
+    return match.groups() if match else None
+
+
+# ------------------------------------------------
+# STORE
+# ------------------------------------------------
+@contextmanager
+def _blob_lock(digest):
+    """Serializes checking for / placing a blob's file in ``store_upload``
+    with removing it in ``collect_media_garbage``, across threads and
+    worker processes (one lock file per shard directory)."""
+    shard = os.path.dirname(media_path(digest))
+    os.makedirs(shard, exist_ok=True)
+    with open(os.path.join(shard, ".lock"), "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _extension(filename):
+    name = secure_filename(filename or "")
+    if "." not in name:
+        return "bin"
+    return name.rsplit(".", 1)[1].lower()[:10] or "bin"
+
+
+def store_upload(file):
+    """Store an uploaded FileStorage under its content hash and take a
+    reference to it. Returns the stored filename (``<digest>.<ext>``).
+
+    The upload is streamed to a temp file while it is hashed, so it is never
+    held in memory. If the same content is already stored, the temp file is
+    dropped and only the reference count goes up. The caller commits.
+
+    The file check and the reference are taken under ``_blob_lock``: garbage
+    collection either removed the blob before (and the file is placed
+    again) or waits for the reference and keeps it.
+    """
+    media_root = get_media_root()
+    extension = _extension(file.filename)
+    sha256 = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=media_root, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            os.fchmod(fd, FILE_MODE)
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                size += len(chunk)
+                tmp.write(chunk)
+
+        digest = sha256.hexdigest()
+        filename = f"{digest}.{extension}"
+        final_path = media_path(filename)
+
+        with _blob_lock(digest):
+            deduplicated = os.path.exists(final_path)
+            if deduplicated:
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, final_path)
+
+            stmt = dialect_insert(MediaBlob).values(
+                digest=digest, extension=extension, size=size, ref_count=1
+            )
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=[MediaBlob.digest],
+                set_={"ref_count": MediaBlob.ref_count + 1},
+            ))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    record_upload(size, deduplicated)
+    return filename
+
+
+def release_media(url):
+    """Drop one reference to the media file behind ``url``, if it is one.
+    Unreferenced files are removed later by ``collect_media_garbage``."""
+    release_media_many([url])
+
+
+def release_media_many(urls):
+    """``release_media`` for several urls with a single UPDATE."""
+    released = Counter(parsed[0] for parsed in map(parse_media_url, urls) if parsed)
+    if not released:
+        return
+    MediaBlob.query.filter(MediaBlob.digest.in_(released)).update(
+        {MediaBlob.ref_count: MediaBlob.ref_count - case(released, value=MediaBlob.digest, else_=0)},
+        synchronize_session=False,
+    )
+
+
+def collect_media_garbage():
+    """Delete unreferenced blobs and their files; returns the count."""
+    removed = 0
+    orphans = (
+        db.session.query(MediaBlob.digest, MediaBlob.extension)
+        .filter(MediaBlob.ref_count <= 0)
+        .all()
+    )
+    for digest, extension in orphans:
+        with _blob_lock(digest):
+            # Re-check the count in the DELETE itself so a blob re-uploaded
+            # since the SELECT is kept; an upload in progress holds the lock
+            # until its reference is written, and the DELETE waits for it
+            deleted = (
+                MediaBlob.query
+                .filter(MediaBlob.digest == digest, MediaBlob.ref_count <= 0)
+                .delete(synchronize_session=False)
+            )
+            db.session.commit()
+            if not deleted:
+                continue
+            shard = os.path.dirname(media_path(digest))
+            # the original plus any generated size variants (<digest>_<variant>.<fmt>)
+            for name in os.listdir(shard):
+                if name == f"{digest}.{extension}" or name.startswith(f"{digest}_"):
+                    os.remove(os.path.join(shard, name))
+        removed += 1
+    return removed
+
+
+# ------------------------------------------------
+# LEGACY UPLOADS
+# ------------------------------------------------
+LEGACY_URL_RE = re.compile(r"/(?:static/)?uploads/(properties|profile_images)/([^/]+)$")
+
+
+def import_legacy_media():
+    """Move images saved under their original filename into the store and
+    rewrite the URLs that point at them. Returns the number of rows updated;
+    the legacy files themselves are left in place."""
+    from werkzeug.datastructures import FileStorage
+    from app.models.property import Property
+    from app.models.user import User
+
+    legacy_root = os.path.join(current_app.static_folder, "uploads")
+    updated = 0
+
+    for model, column in ((Property, Property.image_url), (User, User.profile_image_url)):
+        for row in model.query.filter(column.isnot(None)).all():
+            url = getattr(row, column.key)
+            match = LEGACY_URL_RE.search(url)
+            if not match:
+                continue
+
+            path = os.path.join(legacy_root, match.group(1), match.group(2))
+            if not os.path.isfile(path):
+                continue
+
+            with open(path, "rb") as fh:
+                filename = store_upload(FileStorage(stream=fh, filename=match.group(2)))
+
+            setattr(row, column.key, url[:match.start()] + f"/uploads/media/{filename}")
+            updated += 1
+
+    db.session.commit()
+    return updated
@@ -0,0 +1,168 @@
+import os
+import time
+from flask import Response, current_app, g, jsonify, request
+from sqlalchemy.pool import QueuePool
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram, multiprocess
+except ImportError:  # prometheus_client is optional; without it /metrics is not served
+    prometheus_client = None
+
+# With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py) every worker
+# writes its values to mmap'd files in that directory and /metrics sums
+# them, so any worker can answer a scrape.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+# ------------------------------------------------
+# METRICS
+# ------------------------------------------------
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "Time to build the response (streamed bodies: until the headers).",
+        ("blueprint", "endpoint", "method"),
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUESTS = Counter(
+        "http_requests",
+        "Responses by status code.",
+        ("blueprint", "endpoint", "method", "status"),
+    )
+    IN_FLIGHT = Gauge(
+        "http_requests_in_flight",
+        "Requests being handled, including open streams.",
+        ("blueprint",),
+        multiprocess_mode="livesum",
+    )
+    POOL_WAIT = Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled database connection.",
+        buckets=POOL_WAIT_BUCKETS,
+    )
+    UPLOAD_BYTES = Counter(
+        "upload_bytes",
+        "Uploaded file bytes; deduplicated uploads were already stored.",
+        ("result",),
+    )
+    # Copied from the in-process caches (TTLCache / CompressionStats), see
+    # _sync_cache_metrics. Hit ratio: hits / (hits + misses).
+    CACHE_HITS = Gauge("cache_hits", "Cache hits since worker start.", ("cache",), multiprocess_mode="livesum")
+    CACHE_MISSES = Gauge("cache_misses", "Cache misses since worker start.", ("cache",), multiprocess_mode="livesum")
+    COMPRESSION_BYTES = Gauge(
+        "compression_bytes",
+        "Response bytes before and after compression since worker start.",
+        ("encoding", "stage"),
+        multiprocess_mode="livesum",
+    )
+
+
+def _labels():
+    blueprint = request.blueprint or ""
+    endpoint = request.endpoint or "<unmatched>"  # keep 404s to one series
+    return blueprint, endpoint, request.method
+
+
+# ------------------------------------------------
+# REQUEST HOOKS
+# ------------------------------------------------
+def _before_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_blueprint = request.blueprint or ""
+    IN_FLIGHT.labels(g.metrics_blueprint).inc()
+
+
+def _after_request(response):
+    started = g.get("metrics_started")
+    if started is not None:
+        labels = _labels()
+        REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - started)
+        REQUESTS.labels(*labels, str(response.status_code)).inc()
+    _sync_cache_metrics()
+    return response
+
+
+def _teardown_request(exc):
+    # runs once the response (or stream) is finished, also after errors
+    blueprint = g.pop("metrics_blueprint", None)
+    if blueprint is not None:
+        IN_FLIGHT.labels(blueprint).dec()
+
+
+# ------------------------------------------------
+# CACHE / COMPRESSION STATS
+# ------------------------------------------------
+# The caches keep their own counters; copying them here at most once a
+# second per worker keeps the hot path free of extra metric updates.
+_SYNC_INTERVAL = 1.0
+_last_sync = 0.0
+
+
+def _sync_cache_metrics(force=False):
+    global _last_sync
+    now = time.monotonic()
+    if not force and now - _last_sync < _SYNC_INTERVAL:
+        return
+    _last_sync = now
+
+    from app.utils.cache import response_cache
+    from app.utils.compression import compression_stats
+    from app.utils.jwt_utils import principal_cache_stats
+
+    caches = dict(principal_cache_stats(), responses=response_cache.stats())
+    for name, stats in caches.items():
+        CACHE_HITS.labels(name).set(stats["hits"])
+        CACHE_MISSES.labels(name).set(stats["misses"])
+    for encoding, totals in compression_stats.stats().items():
+        COMPRESSION_BYTES.labels(encoding, "in").set(totals["bytes_in"])
+        COMPRESSION_BYTES.labels(encoding, "out").set(totals["bytes_out"])
+
+
+# ------------------------------------------------
+# DB POOL / UPLOADS
+# ------------------------------------------------
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if prometheus_client is not None:
+                POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def record_upload(size, deduplicated):
+    if prometheus_client is not None:
+        UPLOAD_BYTES.labels("deduplicated" if deduplicated else "stored").inc(size)
+
+
+# ------------------------------------------------
+# ENDPOINT
+# ------------------------------------------------
+def metrics_view():
+    token = current_app.config["METRICS_TOKEN"]
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return jsonify({"error": "Unauthorized"}), 401
+
+    _sync_cache_metrics(force=True)
+    if MULTIPROCESS:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry), mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    if prometheus_client is None or not app.config["METRICS_ENABLED"]:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
@@ -0,0 +1,145 @@
+from flask import current_app
+from app import db
+from app.models.post import Post
+from app.models.property import Property
+from app.utils.stats import bump_stats, property_status_deltas
+from app.utils.search import reindex_properties
+from app.utils.deletion import delete_post_rows, delete_property_rows
+
+PROPERTY_ACTIONS = {"approve": "approved", "decline": "declined", "delete": None}
+POST_ACTIONS = {"delete": None}
+
+# filter key -> column, per bulk endpoint
+PROPERTY_FILTERS = {
+    "status": Property.status,
+    "user_id": Property.user_id,
+    "listing_type": Property.listing_type,
+}
+POST_FILTERS = {"status": Post.status, "user_id": Post.user_id}
+# allowed values of a "status" filter, per model
+STATUSES = {Property: ("pending", "approved", "declined"), Post: ("visible", "hidden")}
+
+
+class BulkRequestError(ValueError):
+    """Raised for a malformed bulk moderation request body."""
+
+
+# ------------------------------------------------
+# REQUEST PARSING
+# ------------------------------------------------
+def parse_bulk_request(data, actions, filters, model):
+    """Validate ``{"action", "ids" | "filter"}`` and return ``(action, ids)``.
+
+    A filter is resolved to ids here (oldest first, capped at
+    BULK_MODERATION_MAX_IDS); callers repeat the request to work through
+    a larger set.
+    """
+    if not isinstance(data, dict):
+        raise BulkRequestError("Expected a JSON object")
+
+    action = data.get("action")
+    if action not in actions:
+        raise BulkRequestError(f"action must be one of: {', '.join(actions)}")
+
+    max_ids = current_app.config["BULK_MODERATION_MAX_IDS"]
+    ids, where = data.get("ids"), data.get("filter")
+    if (ids is None) == (where is None):
+        raise BulkRequestError("Provide either ids or filter")
+
+    if ids is not None:
+        if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+            raise BulkRequestError("ids must be a list of integers")
+        if len(ids) > max_ids:
+            raise BulkRequestError(f"At most {max_ids} ids per request")
+        return action, list(dict.fromkeys(ids))
+
+    if not isinstance(where, dict) or not where or not set(where) <= set(filters):
+        raise BulkRequestError(f"filter keys must be among: {', '.join(filters)}")
+    if not all(type(value) in (str, int, bool) for value in where.values()):
+        raise BulkRequestError("filter values must be strings, integers or booleans")
+    if "status" in where and where["status"] not in STATUSES[model]:
+        raise BulkRequestError(f"status must be one of: {', '.join(STATUSES[model])}")
+    query = db.session.query(model.id).filter(
+        *[filters[name] == value for name, value in where.items()]
+    )
+    return action, [row.id for row in query.order_by(model.id).limit(max_ids)]
+
+
+def _batches(ids):
+    size = current_app.config["BULK_MODERATION_BATCH_SIZE"]
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+# ------------------------------------------------
+# PROPERTIES
+# ------------------------------------------------
+def bulk_moderate_properties(action, ids):
+    """Apply ``action`` to the listings in ``ids`` in the caller's
+    transaction, one SELECT plus one UPDATE/DELETE per batch.
+
+    Returns ``{id: outcome}`` where outcome is the new status, "deleted",
+    "unchanged" (already in that status) or "not_found".
+    """
+    new_status = PROPERTY_ACTIONS[action]
+    outcomes = dict.fromkeys(ids, "not_found")
+    deltas = {}
+
+    for batch in _batches(ids):
+        rows = (
+            db.session.query(Property.id, Property.status, Property.image_url)
+            .filter(Property.id.in_(batch))
+            .with_for_update()
+            .all()
+        )
+        if action == "delete":
+            targets = rows
+        else:
+            targets = [row for row in rows if row.status != new_status]
+            outcomes.update((row.id, "unchanged") for row in rows)
+        if not targets:
+            continue
+
+        target_ids = [row.id for row in targets]
+        if action == "delete":
+            delete_property_rows(targets)
+            outcomes.update((i, "deleted") for i in target_ids)
+            continue
+
+        for row in targets:
+            for name, delta in property_status_deltas(row.status, new_status).items():
+                deltas[name] = deltas.get(name, 0) + delta
+        Property.query.filter(Property.id.in_(target_ids)).update(
+            {Property.status: new_status}, synchronize_session=False
+        )
+        reindex_properties(target_ids)
+        outcomes.update((i, new_status) for i in target_ids)
+
+    bump_stats(**deltas)
+    return outcomes
+
+
+# ------------------------------------------------
+# POSTS
+# ------------------------------------------------
+def bulk_moderate_posts(action, ids):
+    """Delete the posts in ``ids``, with their likes and comments, in the
+    caller's transaction; returns ``{id: "deleted" | "not_found"}``."""
+    outcomes = dict.fromkeys(ids, "not_found")
+    for batch in _batches(ids):
+        found = [row.id for row in db.session.query(Post.id).filter(Post.id.in_(batch)).with_for_update()]
+        if found:
+            delete_post_rows(found)
+            outcomes.update((i, "deleted") for i in found)
+    return outcomes
+
+
+def bulk_response(outcomes):
+    """Per-id outcomes in request order plus a count per outcome."""
+    counts = {}
+    for outcome in outcomes.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return {
+        "results": [{"id": i, "outcome": outcome} for i, outcome in outcomes.items()],
+        "counts": counts,
+    }
@@ -0,0 +1,121 @@
+import base64
+import json
+from datetime import datetime
+from flask import request, jsonify, current_app
+from sqlalchemy import and_, or_
+
+
+class PaginationError(ValueError):
+    """Raised for a malformed ``cursor`` or ``limit`` query parameter."""
+
+
+# ------------------------------------------------
+# CURSOR ENCODING
+# ------------------------------------------------
+def encode_cursor(*values):
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, columns):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise PaginationError("Invalid cursor")
+
+    try:
+        return [_cursor_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, NotImplementedError):
+        raise PaginationError("Invalid cursor")
+
+
+# JSON types a cursor value may arrive as, by the key column's python_type
+_JSON_TYPES = {float: (int, float)}
+
+
+def _cursor_value(column, value):
+    """``value`` checked against the type of its key ``column``, so a
+    tampered cursor is a 400 rather than an error from the database."""
+    expected = column.type.python_type
+    if expected is datetime:
+        if not isinstance(value, str):
+            raise TypeError(value)
+        return datetime.fromisoformat(value)
+    # bool is an int to isinstance, and None would compare as NULL
+    if isinstance(value, bool) or not isinstance(value, _JSON_TYPES.get(expected, expected)):
+        raise TypeError(value)
+    return value
+
+
+# ------------------------------------------------
+# REQUEST ARGS
+# ------------------------------------------------
+def page_args(prefix=""):
+    """Read ``<prefix>cursor`` / ``<prefix>limit``; composite endpoints use a
+    prefix per section (e.g. ``posts_cursor``)."""
+    cursor = request.args.get(f"{prefix}cursor") or None
+    default = current_app.config["DEFAULT_PAGE_SIZE"]
+    maximum = current_app.config["MAX_PAGE_SIZE"]
+
+    try:
+        limit = int(request.args.get(f"{prefix}limit", default))
+    except ValueError:
+        raise PaginationError(f"{prefix}limit must be an integer")
+    if limit < 1:
+        raise PaginationError(f"{prefix}limit must be positive")
+
+    return cursor, min(limit, maximum)
+
+
+# ------------------------------------------------
+# KEYSET PAGINATION
+# ------------------------------------------------
+def _seek(columns, values, descending):
+    # (a, b) < (x, y) written as: a <= x AND (a < x OR b < y), so the leading
+    # column can drive an index range scan.
+    column, value = columns[0], values[0]
+    past = column < value if descending else column > value
+    if len(columns) == 1:
+        return past
+    at_or_past = column <= value if descending else column >= value
+    return and_(at_or_past, or_(past, _seek(columns[1:], values[1:], descending)))
+
+
+def keyset_paginate(query, columns, descending=True, key=None, prefix=""):
+    """Apply ``cursor``/``limit`` from the request to ``query``.
+
+    ``columns`` is the unique sort key, e.g. ``(Post.created_at, Post.id)``.
+    ``key`` extracts those values from a result row; by default they are read
+    off the row by column name. Returns ``(rows, next_cursor)``.
+    """
+    cursor, limit = page_args(prefix)
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        query = query.filter(_seek(columns, values, descending))
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        values = key(last) if key else [getattr(last, c.key) for c in columns]
+        next_cursor = encode_cursor(*values)
+
+    return rows, next_cursor
+
+
+def list_response(items, next_cursor):
+    """JSON array response with the next cursor in the X-Next-Cursor header,
+    for endpoints whose body is a bare list."""
+    response = jsonify(items)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
@@ -0,0 +1,154 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+
+
+class PasswordServiceBusy(Exception):
+    """Raised when the hashing pool is saturated; surfaced as a 503."""
+
+
+# ------------------------------------------------
+# WORKER FUNCTIONS (run inside the pool processes)
+# ------------------------------------------------
+def _hash(raw_password, rounds):
+    return bcrypt.hashpw(raw_password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(raw_password, hashed):
+    return bcrypt.checkpw(raw_password, hashed)
+
+
+# ------------------------------------------------
+# PASSWORD SERVICE
+# ------------------------------------------------
+class PasswordService:
+    """Runs bcrypt in a bounded process pool so a burst of logins cannot pin
+    every request thread on CPU.
+
+    At most ``workers`` hashes run at once and at most ``max_pending`` more
+    may wait; anything beyond that fails fast with PasswordServiceBusy.
+    With ``workers=0`` hashing runs inline in the calling thread.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=16, timeout=10):
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._dummy_lock = threading.Lock()
+        self.configure(rounds, workers, max_pending, timeout)
+
+    def configure(self, rounds=12, workers=2, max_pending=16, timeout=10):
+        """Apply new settings. A running pool is shut down; the next hash
+        starts one of the new size."""
+        self.shutdown()
+        self.rounds = rounds
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._dummy_hash = None   # made with the old rounds
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn, not fork: the app runs threads that a forked
+                    # child must not inherit mid-lock
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _discard_executor(self, executor):
+        # a pool whose child died (OOM, failed spawn) rejects all further
+        # work; drop it so the next call starts a fresh one
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _take_slot(self):
+        slots = self._slots   # configure() may swap it; release this one
+        if not slots.acquire(blocking=False):
+            raise PasswordServiceBusy("Password service is busy, try again shortly")
+        return slots
+
+    def _submit(self, fn, *args):
+        # The slot is given back when the child is done with the work, not
+        # when the caller stops waiting: cancel() can't stop a running hash,
+        # so a timed-out one still holds a worker
+        slots = self._take_slot()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException as error:
+            slots.release()
+            if isinstance(error, BrokenProcessPool):
+                self._discard_executor(executor)
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()   # only helps while it is still queued
+            raise PasswordServiceBusy("Password hashing timed out")
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+
+    def _run(self, fn, *args):
+        if self.workers == 0:
+            slots = self._take_slot()
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+        try:
+            return self._submit(fn, *args)
+        except BrokenProcessPool:
+            pass
+        # retry once on a new pool
+        try:
+            return self._submit(fn, *args)
+        except BrokenProcessPool:
+            raise PasswordServiceBusy("Password service is unavailable, try again shortly")
+
+    def hash_password(self, raw_password):
+        return self._run(_hash, raw_password.encode("utf-8"), self.rounds)
+
+    def verify(self, raw_password, hashed):
+        return self._run(_verify, raw_password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def dummy_verify(self, raw_password):
+        """Spend the same work as a real check, for unknown accounts."""
+        if self._dummy_hash is None:
+            with self._dummy_lock:
+                if self._dummy_hash is None:
+                    self._dummy_hash = self.hash_password("dummy-password")
+        self.verify(raw_password, self._dummy_hash)
+        return False
+
+    def needs_rehash(self, hashed):
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# settings from the app config, applied by init_password_service in create_app
+password_service = PasswordService()
+
+
+def init_password_service(app):
+    password_service.configure(
+        rounds=app.config["BCRYPT_ROUNDS"],
+        workers=app.config["PASSWORD_POOL_WORKERS"],
+        max_pending=app.config["PASSWORD_POOL_MAX_PENDING"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+    )
@@ -0,0 +1,98 @@
+from sqlalchemy import case, func
+from app.models.property import Property
+
+# sort option -> (keyset columns, descending)
+SORTS = {
+    "newest": ((Property.created_at, Property.id), True),
+    "oldest": ((Property.created_at, Property.id), False),
+    "price_asc": ((Property.price, Property.id), False),
+    "price_desc": ((Property.price, Property.id), True),
+}
+
+# Lower bounds of the price facet buckets; the last bucket is open-ended
+PRICE_BUCKETS = (0, 50000, 100000, 250000, 500000, 1000000)
+
+
+# ------------------------------------------------
+# REQUEST PARSING
+# ------------------------------------------------
+def _price_arg(args, name):
+    value = args.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+def parse_listing_filters(args):
+    """Validate listing filters from the query string; raises ValueError."""
+    sort = args.get("sort", "newest")
+    if sort not in SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(SORTS)}")
+
+    return {
+        "min_price": _price_arg(args, "min_price"),
+        "max_price": _price_arg(args, "max_price"),
+        "listing_type": args.get("listing_type"),
+        "sort": sort,
+    }
+
+
+# ------------------------------------------------
+# QUERIES
+# ------------------------------------------------
+def filtered_listings(filters):
+    """Approved properties matching ``filters``, plus the keyset columns and
+    direction for the requested sort. Each filter combination is served by
+    one of the ix_property_status_* indexes."""
+    query = Property.query.filter(Property.status == "approved")
+
+    if filters["listing_type"] is not None:
+        query = query.filter(Property.listing_type == filters["listing_type"])
+    if filters["min_price"] is not None:
+        query = query.filter(Property.price >= filters["min_price"])
+    if filters["max_price"] is not None:
+        query = query.filter(Property.price <= filters["max_price"])
+
+    columns, descending = SORTS[filters["sort"]]
+    if filters["sort"].startswith("price"):
+        # listings without a price can't be placed in a price ordering
+        query = query.filter(Property.price.isnot(None))
+
+    return query, columns, descending
+
+
+def _bucket_label(index):
+    low = PRICE_BUCKETS[index]
+    if index + 1 < len(PRICE_BUCKETS):
+        return f"{low}-{PRICE_BUCKETS[index + 1]}"
+    return f"{low}+"
+
+
+def listing_facets(filters):
+    """Counts per listing_type and per price bucket for the filtered set,
+    from one grouped query that the (status, listing_type, price, id) index
+    covers."""
+    bucket = case(
+        *[(Property.price >= low, i) for i, low in reversed(list(enumerate(PRICE_BUCKETS)))],
+        else_=None,
+    )
+    query, _, _ = filtered_listings(dict(filters, sort="newest"))
+    rows = (
+        query.with_entities(Property.listing_type, bucket.label("bucket"), func.count())
+        .order_by(None)
+        .group_by(Property.listing_type, bucket)
+        .all()
+    )
+
+    by_type = {}
+    by_price = {_bucket_label(i): 0 for i in range(len(PRICE_BUCKETS))}
+    for listing_type, bucket_index, count in rows:
+        key = listing_type or ""
+        by_type[key] = by_type.get(key, 0) + count
+        if bucket_index is not None:
+            by_price[_bucket_label(bucket_index)] += count
+
+    return {"listing_type": by_type, "price": by_price}
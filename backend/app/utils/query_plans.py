@@ -0,0 +1,122 @@
+from datetime import datetime
+from app import db
+from app.models.post import Post
+from app.models.property import Property
+from app.models.comment import Comment
+from app.models.user import User
+from app.utils.feed import community_feed_query
+from app.utils.pagination import _seek
+from app.utils.serializers import columns, ADMIN_POST_FIELDS, ADMIN_PROPERTY_FIELDS
+from app.utils.property_filters import parse_listing_filters, filtered_listings
+
+
+# ------------------------------------------------
+# ROUTE QUERIES UNDER CHECK
+# ------------------------------------------------
+# Each entry mirrors the query a list route runs: (name, query, sort columns,
+# descending). Both the first page and a cursor page are checked.
+def route_queries():
+    return [
+        ("user posts/all", community_feed_query(1), (Post.created_at, Post.id), True),
+        ("user posts/my-posts", Post.query.filter_by(user_id=1), (Post.created_at, Post.id), True),
+        ("user posts/<id>/comments", Comment.query.filter_by(post_id=1), (Comment.created_at, Comment.id), False),
+        ("user properties/all", Property.query.filter_by(status="approved"), (Property.created_at, Property.id), True),
+        *_listing_filter_queries(),
+        ("user properties/my-properties", Property.query.filter_by(user_id=1), (Property.created_at, Property.id), True),
+        ("admin posts/all",
+         db.session.query(*columns(ADMIN_POST_FIELDS)).select_from(Post).outerjoin(User, User.id == Post.user_id),
+         (Post.created_at, Post.id), True),
+        ("admin properties/all",
+         db.session.query(*columns(ADMIN_PROPERTY_FIELDS)).select_from(Property).outerjoin(User, User.id == Property.user_id),
+         (Property.created_at, Property.id), True),
+        ("admin users/all", User.query, (User.id,), True),
+    ]
+
+
+def _listing_filter_queries():
+    cases = [
+        ("listing_type", {"listing_type": "sale"}),
+        ("price range", {"min_price": "1000", "max_price": "5000", "sort": "price_asc"}),
+        ("listing_type + price", {"listing_type": "sale", "max_price": "5000", "sort": "price_desc"}),
+    ]
+    return [
+        (f"user properties/all ({label})", *filtered_listings(parse_listing_filters(args)))
+        for label, args in cases
+    ]
+
+
+def _cursor_values(columns):
+    return [datetime(2000, 1, 1) if c.type.python_type is datetime else 1 for c in columns]
+
+
+def _paged(query, columns, descending, seek):
+    if seek:
+        query = query.filter(_seek(columns, _cursor_values(columns), descending))
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return query.order_by(None).order_by(*order).limit(21)
+
+
+# ------------------------------------------------
+# EXPLAIN
+# ------------------------------------------------
+def _explain(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect)
+    if connection.dialect.name == "sqlite":
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    return explain_sql(connection, str(compiled), params)
+
+
+def explain_sql(connection, sql, params):
+    """Plan lines for a statement as sent to the driver (SQL text and its
+    parameters), e.g. one captured from a before_cursor_execute event."""
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[-1] for row in rows]
+
+    # On Postgres, disabling seq scans and sorts makes the planner pick an
+    # index whenever one is usable, so a remaining "Seq Scan" or "Sort" node
+    # means the index is missing rather than just not worth it on a small table.
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    connection.exec_driver_sql("SET LOCAL enable_sort = off")
+    rows = connection.exec_driver_sql("EXPLAIN " + sql, params)
+    return [row[0] for row in rows]
+
+
+# Whole-table reads that are fine: the rowid-ordered user list is stopped by
+# LIMIT, and stat_counter holds one row per dashboard counter
+EXPECTED_SCANS = {"SCAN user", "SCAN stat_counter"}
+
+
+def plan_problems(plan, dialect_name):
+    """Lines of ``plan`` that read a whole table or sort in a temp structure."""
+    problems = []
+    for line in plan:
+        if dialect_name == "sqlite":
+            if "TEMP B-TREE" in line:
+                problems.append(line)
+            # "SCAN t USING INDEX ..." walks an index in order and
+            # "SCAN t VIRTUAL TABLE INDEX ..." is an FTS match; a bare
+            # "SCAN t" reads the whole table
+            elif (line.startswith("SCAN") and "USING" not in line
+                  and "VIRTUAL TABLE" not in line and line not in EXPECTED_SCANS):
+                problems.append(line)
+        elif "Seq Scan" in line or line.strip().startswith("Sort"):
+            problems.append(line.strip())
+    return problems
+
+
+def check_query_plans():
+    """Run EXPLAIN for every list route query and return
+    ``[(name, plan, problems)]``."""
+    results = []
+    with db.engine.connect() as connection:
+        for name, query, columns, descending in route_queries():
+            for seek in (False, True):
+                label = f"{name} ({'cursor page' if seek else 'first page'})"
+                statement = _paged(query, columns, descending, seek).statement
+                with connection.begin():
+                    plan = _explain(connection, statement)
+                results.append((label, plan, plan_problems(plan, connection.dialect.name)))
+    return results
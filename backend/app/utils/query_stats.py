@@ -0,0 +1,127 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# "(?, ?, ?)" / "(%(p1)s, %(p2)s)" lists, e.g. expanded IN clauses and
+# multi-row VALUES, so the same query with a different number of ids has
+# one shape
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in strict mode (SQL_N_PLUS_ONE_STRICT) when one statement
+    shape runs SQL_N_PLUS_ONE_THRESHOLD times in a request."""
+
+
+def statement_shape(statement):
+    return _WHITESPACE.sub(" ", _PARAM_LIST.sub("(...)", statement)).strip()
+
+
+# ------------------------------------------------
+# PER-REQUEST STATS
+# ------------------------------------------------
+class RequestQueryStats:
+    """Statements run while handling one request: count, total time, and
+    how often each statement shape ran."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        return shape, self.shapes[shape]
+
+    def repeated(self, threshold):
+        """(shape, count) for shapes that ran at least ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def current_query_stats():
+    """Stats for the current request, or None outside one / before any SQL."""
+    return g.get("sql_stats") if has_request_context() else None
+
+
+# ------------------------------------------------
+# ENGINE HOOKS
+# ------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None or not has_request_context():
+        return
+
+    stats = g.get("sql_stats")
+    if stats is None:
+        stats = g.sql_stats = RequestQueryStats()
+    shape, runs = stats.record(statement, time.perf_counter() - started)
+
+    # raise at the statement that crossed the threshold, so the traceback
+    # points at the loop issuing it
+    config = current_app.config
+    if config["SQL_N_PLUS_ONE_STRICT"] and runs == config["SQL_N_PLUS_ONE_THRESHOLD"]:
+        raise NPlusOneError(f"{runs} executions in {request.method} {request.path} of: {shape}")
+
+
+def instrument_engine(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ------------------------------------------------
+# RESPONSE HOOK
+# ------------------------------------------------
+def _report(response):
+    stats = current_query_stats()
+    if stats is None:
+        return response
+
+    config = current_app.config
+    duration_ms = round(stats.seconds * 1000, 2)
+    if config["SQL_SERVER_TIMING"]:
+        noun = "query" if stats.count == 1 else "queries"
+        timing = f'db;dur={duration_ms};desc="{stats.count} {noun}"'
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+    repeated = stats.repeated(config["SQL_N_PLUS_ONE_THRESHOLD"])
+    record = {
+        "event": "sql",
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "status": response.status_code,
+        "queries": stats.count,
+        "duration_ms": duration_ms,
+    }
+    if repeated:
+        record["n_plus_one"] = [{"count": n, "statement": shape} for shape, n in repeated]
+        logger.warning(json.dumps(record), extra={"sql": record})
+    else:
+        logger.info(json.dumps(record), extra={"sql": record})
+    return response
+
+
+def init_query_stats(app, engines):
+    """Instrument ``engines`` and report per-request SQL when
+    SQL_INSTRUMENTATION is on."""
+    if not app.config["SQL_INSTRUMENTATION"]:
+        return
+    for engine in engines:
+        instrument_engine(engine)
+    app.after_request(_report)
@@ -0,0 +1,201 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Replica engines are SQLALCHEMY_BINDS entries named replica_0, replica_1, ...
+# (built from DATABASE_REPLICA_URLS in app/config.py). No model is bound to
+# them; only RoutingSession picks them.
+REPLICA_PREFIX = "replica_"
+
+# session.info keys
+_WROTE = "replicas.wrote"        # this transaction flushed or ran DML
+_REPLICA = "replicas.key"        # replica chosen for this session
+
+
+# ------------------------------------------------
+# REPLICA HEALTH
+# ------------------------------------------------
+class ReplicaPool:
+    """Tracks which replicas are usable. A replica that fails to connect is
+    skipped for ``retry_after`` seconds, then tried again."""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        self._down_until = {}
+        self._lock = threading.Lock()
+        self.reads = {}
+        self.fallbacks = 0
+
+    def choose(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            healthy = [key for key in keys if self._down_until.get(key, 0) <= now]
+        return random.choice(healthy) if healthy else None
+
+    def is_up(self, key):
+        with self._lock:
+            return self._down_until.get(key, 0) <= time.monotonic()
+
+    def mark_down(self, key):
+        with self._lock:
+            self._down_until[key] = time.monotonic() + self.retry_after
+            self.fallbacks += 1
+
+    def record_read(self, key):
+        with self._lock:
+            self.reads[key] = self.reads.get(key, 0) + 1
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "reads": dict(self.reads),
+                "fallbacks": self.fallbacks,
+                "down": sorted(key for key, until in self._down_until.items() if until > now),
+            }
+
+
+# ------------------------------------------------
+# READ-YOUR-WRITES
+# ------------------------------------------------
+# user id -> recently wrote. Uses the response cache's backend type, so with
+# RESPONSE_CACHE_BACKEND=redis every worker sees the same marks.
+def _build_sticky_store(config):
+    from app.utils.cache import LocalCacheBackend, RedisCacheBackend
+
+    if config["RESPONSE_CACHE_BACKEND"] == "redis":
+        return RedisCacheBackend(config["RESPONSE_CACHE_URL"], prefix="dacity:sticky:")
+    return LocalCacheBackend(maxsize=config["REPLICA_STICKY_SIZE"])
+
+
+# both set up from the app config by init_replicas in create_app
+_sticky = None
+replica_pool = ReplicaPool(retry_after=30)
+
+
+def init_replicas(app):
+    global _sticky
+    _sticky = _build_sticky_store(app.config)
+    replica_pool.retry_after = app.config["REPLICA_RETRY_AFTER"]
+
+
+def _mark_sticky(user_id, seconds):
+    _sticky.set(f"user:{user_id}", 1, ttl=seconds)
+
+
+def _is_sticky(user_id):
+    return _sticky.get(f"user:{user_id}") is not None
+
+
+# ------------------------------------------------
+# ROUTING SESSION
+# ------------------------------------------------
+def _replica_reads_enabled():
+    return has_request_context() and g.get("db_read_only", False)
+
+
+class RoutingSession(Session):
+    """``db.session`` class: inside a ``read_only`` handler, SELECTs go to a
+    replica; flushes, DML, and every read after a write in the same
+    transaction go to the primary. If the replica can't be reached the
+    statement falls back to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica = self._replica_for(clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_for(self, clause):
+        if not _replica_reads_enabled() or self._flushing or self.info.get(_WROTE):
+            return None
+        if getattr(clause, "is_dml", False):
+            return None
+
+        engines = self._db.engines
+        key = self.info.get(_REPLICA)
+        if key is None or not replica_pool.is_up(key):
+            key = replica_pool.choose([k for k in engines if k and k.startswith(REPLICA_PREFIX)])
+            if key is None:
+                return None
+            # one replica per request, so its reads see a single snapshot
+            self.info[_REPLICA] = key
+        replica_pool.record_read(key)
+        return engines[key]
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except OperationalError:
+            key = self.info.get(_REPLICA)
+            if key is None or self._db.engines.get(key) is not engine:
+                raise
+            logger.warning("Replica %s unavailable, reading from the primary", key, exc_info=True)
+            replica_pool.mark_down(key)
+            del self.info[_REPLICA]
+            return super()._connection_for_bind(self._db.engine, execution_options, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    if session.info.pop(_WROTE, False) and has_request_context():
+        user_id = g.get("current_user_id")
+        if user_id is not None:
+            from flask import current_app
+            _mark_sticky(user_id, current_app.config["REPLICA_STICKY_SECONDS"])
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_WROTE, None)
+
+
+# ------------------------------------------------
+# DECORATOR
+# ------------------------------------------------
+def read_only(f):
+    """Let a handler's queries run on a replica. Goes under
+    ``token_required`` (and ``admin_required``); users who wrote in the
+    last REPLICA_STICKY_SECONDS keep reading from the primary."""
+    @wraps(f)
+    def decorated(current_user, *args, **kwargs):
+        g.db_read_only = not _is_sticky(current_user.id)
+        return f(current_user, *args, **kwargs)
+
+    return decorated
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside a ``read_only`` handler, e.g. while
+    building a payload that will be cached."""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get("db_read_only", False)
+    g.db_read_only = False
+    try:
+        yield
+    finally:
+        g.db_read_only = previous
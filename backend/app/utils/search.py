@@ -0,0 +1,114 @@
+import re
+from sqlalchemy import Float, bindparam, literal_column, func, table, column, text
+from app import db
+from app.models.property import Property
+
+# Words of letters/digits; everything else (FTS operators, quotes) is dropped
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TOKENS = 8
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def _tokens(query_text):
+    return TOKEN_RE.findall(query_text or "")[:MAX_TOKENS]
+
+
+# ------------------------------------------------
+# INDEX MAINTENANCE
+# ------------------------------------------------
+# SQLite: the property_fts FTS5 table holds approved listings only, keyed by
+# property id, and is written here in the same transaction as the listing.
+# Postgres: property.search_vector is a generated tsvector column with a GIN
+# index, so it is always in sync and these functions do nothing.
+def sync_property_index(prop):
+    """Index ``prop`` if it is approved, otherwise drop it from the index."""
+    if _dialect() != "sqlite":
+        return
+    db.session.execute(text("DELETE FROM property_fts WHERE rowid = :id"), {"id": prop.id})
+    if prop.status == "approved":
+        db.session.execute(
+            text("INSERT INTO property_fts (rowid, title, description) VALUES (:id, :title, :description)"),
+            {"id": prop.id, "title": prop.title, "description": prop.description or ""},
+        )
+
+
+def reindex_properties(property_ids):
+    """``sync_property_index`` for many listings with two set-based statements."""
+    if _dialect() != "sqlite" or not property_ids:
+        return
+    ids = list(property_ids)
+    unindex_properties(ids)
+    db.session.execute(
+        text(
+            "INSERT INTO property_fts (rowid, title, description) "
+            "SELECT id, title, COALESCE(description, '') FROM property "
+            "WHERE status = 'approved' AND id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"ids": ids},
+    )
+
+
+def unindex_properties(property_ids):
+    if _dialect() != "sqlite" or not property_ids:
+        return
+    fts = table("property_fts", column("rowid"))
+    db.session.execute(fts.delete().where(fts.c.rowid.in_(list(property_ids))))
+
+
+def rebuild_property_index():
+    """Re-create the SQLite index from the approved listings."""
+    if _dialect() != "sqlite":
+        return None
+    db.session.execute(text("DELETE FROM property_fts"))
+    result = db.session.execute(text(
+        "INSERT INTO property_fts (rowid, title, description) "
+        "SELECT id, title, COALESCE(description, '') FROM property WHERE status = 'approved'"
+    ))
+    db.session.commit()
+    return result.rowcount
+
+
+# ------------------------------------------------
+# SEARCH
+# ------------------------------------------------
+def search_query(query_text):
+    """Return ``(query, sort_columns)`` for approved properties matching
+    ``query_text``, best match first, or None if there is nothing to search.
+
+    Every word is prefix-matched and all must appear. The first sort column
+    is an ascending rank (lower is better), the second the property id, so
+    the result can be keyset-paginated like any other list.
+    """
+    tokens = _tokens(query_text)
+    if not tokens:
+        return None
+
+    if _dialect() == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in tokens))
+        vector = literal_column("property.search_vector")
+        rank = (-func.ts_rank(vector, tsquery)).cast(Float)
+        query = db.session.query(Property, rank.label("rank")).filter(vector.op("@@")(tsquery))
+    else:
+        match = " ".join(f'"{t}"*' for t in tokens)
+        fts = table("property_fts", column("rowid"))
+        # bm25() is only allowed in the FTS query itself, so rank in a
+        # subquery and seek/sort on its output column
+        ranked = (
+            db.session.query(
+                fts.c.rowid.label("property_id"),
+                literal_column("bm25(property_fts)", Float).label("rank"),
+            )
+            .select_from(fts)
+            .filter(literal_column("property_fts").op("MATCH")(match))
+            .subquery()
+        )
+        rank = ranked.c.rank
+        query = (
+            db.session.query(Property, rank)
+            .join(ranked, ranked.c.property_id == Property.id)
+        )
+
+    return query.filter(Property.status == "approved"), (rank, Property.id)
@@ -0,0 +1,101 @@
+from sqlalchemy import func
+from app.models.user import User
+from app.models.post import Post
+from app.models.comment import Comment
+from app.models.property import Property
+from app.utils.images import image_variants
+
+
+# ------------------------------------------------
+# FIELD SETS
+# ------------------------------------------------
+# Output key -> column. List endpoints select exactly these columns
+# (``columns(FIELDS)``) so rows come back as plain tuples without building
+# ORM objects, and ``row_dicts`` turns them into response dicts. Datetimes
+# are left as-is for the JSON provider to write as ISO 8601.
+AUTHOR_NAME = func.coalesce(User.name, "Unknown")  # outer-joined User
+
+PROPERTY_FIELDS = {
+    "id": Property.id,
+    "user_id": Property.user_id,
+    "title": Property.title,
+    "description": Property.description,
+    "price": Property.price,
+    "status": Property.status,
+    "created_at": Property.created_at,
+    "image_url": Property.image_url,
+    "listingType": Property.listing_type,
+}
+
+ADMIN_PROPERTY_FIELDS = {
+    "id": Property.id,
+    "user_id": Property.user_id,
+    "user_name": AUTHOR_NAME,
+    "title": Property.title,
+    "description": Property.description,
+    "price": Property.price,
+    "status": Property.status,
+    "created_at": Property.created_at,
+}
+
+POST_FIELDS = {
+    "id": Post.id,
+    "content": Post.content,
+    "image_url": Post.image_url,
+    "created_at": Post.created_at,
+}
+
+ADMIN_POST_FIELDS = {
+    "id": Post.id,
+    "user_id": Post.user_id,
+    "user_name": AUTHOR_NAME,
+    "content": Post.content,
+    "image_url": Post.image_url,
+    "status": Post.status,
+    "created_at": Post.created_at,
+}
+
+COMMENT_FIELDS = {
+    "id": Comment.id,
+    "user_id": Comment.user_id,
+    "user_name": AUTHOR_NAME,
+    "post_id": Comment.post_id,
+    "content": Comment.content,
+    "created_at": Comment.created_at,
+}
+
+USER_FIELDS = {
+    "id": User.id,
+    "name": User.name,
+    "email": User.email,
+    "is_admin": User.is_admin,
+    "profile_image_url": User.profile_image_url,
+}
+
+
+def columns(fields):
+    """The labelled columns to pass to ``with_entities`` / ``query``."""
+    return tuple(column.label(name) for name, column in fields.items())
+
+
+# ------------------------------------------------
+# SERIALIZERS
+# ------------------------------------------------
+def row_dicts(rows, fields):
+    """Dicts for rows selected with ``columns(fields)``; extra columns in
+    the row (e.g. a search rank) are left out."""
+    return [{name: row._mapping[name] for name in fields} for row in rows]
+
+
+def property_dicts(rows, media_root):
+    items = row_dicts(rows, PROPERTY_FIELDS)
+    for item in items:
+        item["image_variants"] = image_variants(item["image_url"], media_root)
+    return items
+
+
+def property_dict(prop, media_root):
+    """A single Property instance, in the same shape as ``property_dicts``."""
+    item = {name: getattr(prop, column.key) for name, column in PROPERTY_FIELDS.items()}
+    item["image_variants"] = image_variants(prop.image_url, media_root)
+    return item
@@ -0,0 +1,37 @@
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+
+
+# ------------------------------------------------
+# DIALECT-SPECIFIC INSERT
+# ------------------------------------------------
+def dialect_insert(model):
+    """``INSERT`` construct for the bound database that supports
+    ``on_conflict_do_nothing`` / ``on_conflict_do_update`` (SQLite and
+    Postgres both implement ON CONFLICT)."""
+    name = db.session.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql.insert(model)
+    if name == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported on {name}")
+
+
+# ------------------------------------------------
+# SQLITE CONNECTION SETUP
+# ------------------------------------------------
+def configure_sqlite_engine(engine, pragmas):
+    """Run ``pragmas`` (SQLITE_PRAGMAS) on every new SQLite connection."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # SQLite ignores FOREIGN KEY clauses (and so ON DELETE CASCADE)
+        # unless this is set on each connection
+        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -0,0 +1,87 @@
+import hashlib
+import mimetypes
+import os
+import re
+from flask import abort, current_app, request, send_file
+from werkzeug.security import safe_join
+from werkzeug.wrappers import Response
+from app.utils.cache import TTLCache
+
+# <sha256>.<ext> originals and <sha256>_<variant>.<ext> variants never change
+CONTENT_HASHED_RE = re.compile(r"^[0-9a-f]{64}(?:_[a-z]+)?\.[a-z0-9]+$")
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# (path, mtime_ns, size) -> sha256, so legacy files are hashed once
+_etag_cache = TTLCache(maxsize=4096)
+
+
+# ------------------------------------------------
+# ETAGS
+# ------------------------------------------------
+def _content_etag(path, stat):
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    etag = _etag_cache.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(64 * 1024), b""):
+                digest.update(chunk)
+        etag = digest.hexdigest()
+        _etag_cache.set(key, etag)
+    return etag
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since:
+        return int(last_modified) <= request.if_modified_since.timestamp()
+    return False
+
+
+# ------------------------------------------------
+# SEND
+# ------------------------------------------------
+def send_upload(directory, filename):
+    """Serve an uploaded file with strong content ETags and long-lived
+    caching for content-hashed names.
+
+    Conditional requests are answered with a 304 from ``stat`` alone; full
+    and ``Range`` requests go through ``send_file`` (which honours
+    ``USE_X_SENDFILE``) or, when ``UPLOAD_ACCEL_REDIRECT_PREFIX`` is set, are
+    handed to nginx with ``X-Accel-Redirect``.
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    stat = os.stat(path)
+    hashed = CONTENT_HASHED_RE.match(os.path.basename(filename))
+    if hashed:
+        etag = os.path.basename(filename)
+        max_age = IMMUTABLE_MAX_AGE
+    else:
+        etag = _content_etag(path, stat)
+        max_age = current_app.config["UPLOAD_CACHE_MAX_AGE"]
+
+    if _not_modified(etag, stat.st_mtime):
+        response = Response(status=304)
+    else:
+        accel_prefix = current_app.config.get("UPLOAD_ACCEL_REDIRECT_PREFIX")
+        if accel_prefix:
+            relative = os.path.relpath(path, current_app.static_folder).replace(os.sep, "/")
+            response = Response(
+                mimetype=mimetypes.guess_type(path)[0] or "application/octet-stream"
+            )
+            response.headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + relative
+        else:
+            response = send_file(path, conditional=True, etag=etag, max_age=max_age)
+
+    response.set_etag(etag)
+    response.last_modified = stat.st_mtime
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if hashed:
+        response.cache_control.immutable = True
+    return response
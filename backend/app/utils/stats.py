@@ -0,0 +1,83 @@
+from sqlalchemy import case, func, select
+from app import db
+from app.models.stats import StatCounter
+from app.models.user import User
+from app.models.post import Post
+from app.models.property import Property
+from app.utils.sql import dialect_insert
+
+COUNTERS = (
+    "total_users",
+    "total_posts",
+    "total_properties",
+    "pending_properties",
+    "approved_properties",
+)
+
+# property status -> counter tracking it
+STATUS_COUNTERS = {"pending": "pending_properties", "approved": "approved_properties"}
+
+
+# ------------------------------------------------
+# INCREMENTAL UPDATES
+# ------------------------------------------------
+def bump_stats(**deltas):
+    """Apply counter deltas in the caller's transaction with one UPDATE,
+    e.g. ``bump_stats(total_posts=1)``."""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    StatCounter.query.filter(StatCounter.name.in_(deltas)).update(
+        {StatCounter.value: StatCounter.value + case(deltas, value=StatCounter.name, else_=0)},
+        synchronize_session=False,
+    )
+
+
+def property_status_deltas(old_status, new_status, total=0):
+    """Counter deltas for a property moving between statuses; pass
+    ``None`` for the side that does not exist (creation / deletion)."""
+    deltas = {"total_properties": total}
+    if old_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[old_status]] = -1
+    if new_status in STATUS_COUNTERS:
+        name = STATUS_COUNTERS[new_status]
+        deltas[name] = deltas.get(name, 0) + 1
+    return deltas
+
+
+# ------------------------------------------------
+# FULL RECOMPUTE
+# ------------------------------------------------
+def compute_stats():
+    """Every dashboard figure from a single conditional-aggregation query."""
+    users = select(func.count(User.id)).scalar_subquery()
+    posts = select(func.count(Post.id)).scalar_subquery()
+    row = db.session.query(
+        users,
+        posts,
+        func.count(Property.id),
+        func.coalesce(func.sum(case((Property.status == "pending", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Property.status == "approved", 1), else_=0)), 0),
+    ).select_from(Property).one()
+    return dict(zip(COUNTERS, (int(v) for v in row)))
+
+
+def rebuild_stats():
+    stats = compute_stats()
+    stmt = dialect_insert(StatCounter).values(
+        [{"name": name, "value": value} for name, value in stats.items()]
+    )
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[StatCounter.name],
+        set_={"value": stmt.excluded.value},
+    ))
+    db.session.commit()
+    return stats
+
+
+def get_stats():
+    """Read the rollup (one indexed lookup); rebuild it if it is missing."""
+    rows = dict(db.session.query(StatCounter.name, StatCounter.value).all())
+    if any(name not in rows for name in COUNTERS):
+        return rebuild_stats()
+    return {name: rows[name] for name in COUNTERS}
@@ -0,0 +1,95 @@
+"""Compare the old list-serialization path with the column-tuple one.
+
+    python benchmarks/json_responses.py [rows] [repeats]
+
+"old": ORM objects, hand-built dicts, Flask's default JSON provider.
+"new": column tuples (serializers.row_dicts) and FastJSONProvider.
+Runs against a throwaway in-memory SQLite database.
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from app import config  # noqa: E402
+
+config.Config.SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+from app import create_app, db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.property import Property  # noqa: E402
+from app.utils.json_provider import FastJSONProvider, orjson  # noqa: E402
+from app.utils.serializers import columns, row_dicts, ADMIN_PROPERTY_FIELDS  # noqa: E402
+
+
+def seed(rows):
+    db.create_all()
+    db.session.add(User(id=1, name="Bench", email="bench@example.com", password="x"))
+    db.session.flush()
+    start = datetime(2024, 1, 1)
+    db.session.execute(Property.__table__.insert(), [{
+        "user_id": 1,
+        "title": f"Listing {i}",
+        "description": "Three bedroom flat with a view " * 4,
+        "price": 1000.0 + i,
+        "status": "approved",
+        "created_at": start + timedelta(minutes=i),
+        "listing_type": "sale",
+    } for i in range(rows)])
+    db.session.commit()
+
+
+def old_path(app):
+    rows = db.session.query(Property, User.name).outerjoin(User, User.id == Property.user_id).all()
+    items = [{
+        "id": p.id,
+        "user_id": p.user_id,
+        "user_name": user_name or "Unknown",
+        "title": p.title,
+        "description": p.description,
+        "price": p.price,
+        "status": p.status,
+        "created_at": p.created_at.isoformat()
+    } for p, user_name in rows]
+    db.session.expunge_all()
+    return DefaultJSONProvider(app).response(items).get_data()
+
+
+def new_path(app):
+    rows = (
+        db.session.query(*columns(ADMIN_PROPERTY_FIELDS))
+        .select_from(Property)
+        .outerjoin(User, User.id == Property.user_id)
+        .all()
+    )
+    return FastJSONProvider(app).response(row_dicts(rows, ADMIN_PROPERTY_FIELDS)).get_data()
+
+
+def best_of(fn, app, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        body = fn(app)
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(body)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    app = create_app()
+    with app.app_context():
+        seed(rows)
+        print(f"{rows} rows, best of {repeats}, orjson {'on' if orjson else 'off'}")
+        old, old_size = best_of(old_path, app, repeats)
+        new, new_size = best_of(new_path, app, repeats)
+        print(f"old  {old * 1000:8.1f} ms  {old_size} bytes")
+        print(f"new  {new * 1000:8.1f} ms  {new_size} bytes  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
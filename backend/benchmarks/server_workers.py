@@ -0,0 +1,162 @@
+"""Throughput of the gunicorn worker models on the feed and listing endpoints.
+
+    python benchmarks/server_workers.py [concurrency] [seconds] [worker classes...]
+
+Starts gunicorn -c gunicorn.conf.py wsgi:app once per worker class (default:
+sync gthread gevent; gevent is skipped when not installed) with WEB_CONCURRENCY
+workers (default 2) on a copy of instance/data.db. Each run sends
+``concurrency`` client threads with keep-alive connections at
+GET /api/users/posts/all (the feed, one query per request) and
+GET /api/users/properties/all (listings, mostly served from the response
+cache) for ``seconds`` seconds each. Reports requests/s and p50/p99 latency.
+
+The client runs in this process, so at high concurrency it can become the
+bottleneck. Compare the worker models against each other, not against
+absolute numbers.
+"""
+import http.client
+import os
+import secrets
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, BACKEND)
+
+HOST, PORT = "127.0.0.1", 8765
+ENDPOINTS = ("/api/users/posts/all", "/api/users/properties/all")
+
+
+def prepare_database(tmp):
+    """Migrated copy of instance/data.db, and a token for one of its users."""
+    path = os.path.join(tmp, "data.db")
+    shutil.copy(os.path.join(BACKEND, "instance", "data.db"), path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    # the production profile has no default key; the server inherits this one
+    os.environ.setdefault("SECRET_KEY", secrets.token_hex(32))
+
+    from flask_migrate import upgrade
+    from app import config, create_app, db
+    from app.models.user import User
+    from app.utils.jwt_utils import create_token
+
+    config.Config.SQLALCHEMY_DATABASE_URI = os.environ["DATABASE_URL"]
+    app = create_app("production")
+    with app.app_context():
+        upgrade(directory=os.path.join(BACKEND, "migrations"))
+        user_id = db.session.query(User.id).order_by(User.id).limit(1).scalar()
+        db.engine.dispose()
+        return create_token(user_id)
+
+
+def start_server(worker_class, workers):
+    env = dict(
+        os.environ,
+        WEB_WORKER_CLASS=worker_class,
+        WEB_CONCURRENCY=str(workers),
+        WEB_BIND=f"{HOST}:{PORT}",
+        WEB_ACCESS_LOG="/dev/null",
+        WEB_LOG_LEVEL="warning",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=BACKEND, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(HOST, PORT, timeout=1)
+            conn.request("GET", "/api/auth/test")
+            conn.getresponse().read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+
+
+def client(path, headers, stop, latencies, errors):
+    conn = http.client.HTTPConnection(HOST, PORT, timeout=30)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def load(path, token, concurrency, seconds):
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=client, args=(path, headers, stop, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000 if latencies else 0.0
+    return len(latencies) / seconds, pct(0.5), pct(0.99), len(errors)
+
+
+def available(worker_class):
+    if worker_class != "gevent":
+        return True
+    try:
+        import gevent  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    worker_classes = sys.argv[3:] or ["sync", "gthread", "gevent"]
+    workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+    tmp = tempfile.mkdtemp()
+    try:
+        token = prepare_database(tmp)
+        print(f"{workers} workers, {concurrency} clients, {seconds:g}s per endpoint")
+        for worker_class in worker_classes:
+            if not available(worker_class):
+                print(f"{worker_class:8} skipped (not installed)")
+                continue
+            server = start_server(worker_class, workers)
+            try:
+                for path in ENDPOINTS:
+                    load(path, token, concurrency, 1)  # warm up caches and pools
+                    rps, p50, p99, errors = load(path, token, concurrency, seconds)
+                    print(
+                        f"{worker_class:8} {path:28} {rps:8.0f} req/s  "
+                        f"p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  errors {errors}"
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
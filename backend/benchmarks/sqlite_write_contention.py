@@ -0,0 +1,117 @@
+"""Concurrent readers and writers against one SQLite file, before and after
+the connection tuning in Config.SQLITE_PRAGMAS / engine_options.
+
+    python benchmarks/sqlite_write_contention.py [writers] [readers] [seconds]
+
+"baseline": rollback journal, no pragmas, SQLAlchemy's default engine options.
+"tuned":    the testing profile's SQLITE_PRAGMAS (WAL, busy_timeout,
+            synchronous=NORMAL, mmap, cache size) and pool settings.
+Writers insert posts (one commit each), readers page the newest posts.
+Each run uses a fresh temporary database file.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.config import TestingConfig  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.post import Post  # noqa: E402
+
+
+def make_app(path, tuned):
+    overrides = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"}
+    if not tuned:
+        overrides.update(SQLITE_PRAGMAS={}, SQLALCHEMY_ENGINE_OPTIONS={})
+    return create_app(type("BenchConfig", (TestingConfig,), overrides))
+
+
+def writer(app, stop, totals):
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                db.session.add(Post(user_id=1, content="contention"))
+                db.session.commit()
+                totals.bump("writes")
+            except OperationalError:
+                db.session.rollback()
+                totals.bump("write_errors")
+        db.session.remove()
+
+
+def reader(app, stop, totals):
+    query = select(Post.id, Post.content).order_by(Post.created_at.desc(), Post.id.desc()).limit(20)
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                db.session.execute(query).all()
+                db.session.rollback()
+                totals.bump("reads")
+            except OperationalError:
+                db.session.rollback()
+                totals.bump("read_errors")
+        db.session.remove()
+
+
+class Totals:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(("writes", "write_errors", "reads", "read_errors"), 0)
+
+    def bump(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+
+def run(tuned, writers, readers, seconds):
+    tmp = tempfile.mkdtemp()
+    try:
+        app = make_app(os.path.join(tmp, "bench.db"), tuned)
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(id=1, name="Bench", email="bench@example.com", password="x"))
+            db.session.commit()
+            mode = db.session.execute(db.text("PRAGMA journal_mode")).scalar()
+
+        stop = threading.Event()
+        totals = Totals()
+        threads = [threading.Thread(target=writer, args=(app, stop, totals)) for _ in range(writers)]
+        threads += [threading.Thread(target=reader, args=(app, stop, totals)) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            db.engine.dispose()
+        return mode, totals.counts
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    print(f"{writers} writers, {readers} readers, {seconds:g}s each")
+    for name, tuned in (("baseline", False), ("tuned", True)):
+        mode, counts = run(tuned, writers, readers, seconds)
+        print(
+            f"{name:8}  journal={mode:6}  "
+            f"writes/s {counts['writes'] / seconds:8.0f}  write errors {counts['write_errors']:5}  "
+            f"reads/s {counts['reads'] / seconds:8.0f}  read errors {counts['read_errors']:5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
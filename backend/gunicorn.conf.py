@@ -0,0 +1,114 @@
+"""Gunicorn settings, all overridable from the environment.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+WEB_WORKER_CLASS picks the worker model:
+
+  sync     one request per process. The simplest model, and CPU-bound
+           work (bcrypt, JSON) gets a whole core. The live feed is
+           refused with 503: a stream would block the worker and be
+           killed after `timeout`.
+  gthread  WEB_THREADS threads per process. The default. I/O waits (the
+           database, uploads) overlap within a process, and memory per
+           request is lower than with sync. Each live-feed stream holds a
+           thread for up to EVENT_STREAM_MAX_AGE, so at most half the
+           threads per process serve streams; the rest stay for the API.
+  gevent   greenlets, up to WEB_WORKER_CONNECTIONS per process. Required
+           to serve the live feed to many clients: a stream costs a
+           greenlet, not a thread. Needs the gevent package, and
+           psycogreen when running on Postgres.
+
+The app is preloaded in the master, so workers share its memory
+copy-on-write. Each worker then drops the master's database connections
+(post_fork) and opens its own.
+"""
+import multiprocessing
+import os
+
+worker_class = os.environ.get("WEB_WORKER_CLASS", "gthread")
+
+if worker_class == "gevent":
+    # patch before the app (and its locks, sockets, thread pools) is imported
+    # by preload_app, not afterwards in the worker
+    from gevent import monkey
+
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:  # psycogreen is optional; only needed on Postgres
+        pass
+    else:
+        patch_psycopg()
+
+_cores = multiprocessing.cpu_count()
+_default_workers = _cores * 2 + 1 if worker_class == "sync" else _cores + 1
+
+bind = os.environ.get("WEB_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", _default_workers))
+threads = int(os.environ.get("WEB_THREADS", 4)) if worker_class == "gthread" else 1
+worker_connections = int(os.environ.get("WEB_WORKER_CONNECTIONS", 1000))
+
+# Live-feed (SSE) streams per process, read by app/config.py when the app
+# is preloaded below; see the worker models above
+_stream_caps = {"sync": 0, "gthread": threads // 2, "gevent": worker_connections // 2}
+os.environ.setdefault("EVENT_STREAM_MAX_CONNECTIONS", str(_stream_caps.get(worker_class, 0)))
+
+preload_app = True
+
+# Connections: keep idle keep-alive connections open long enough to be
+# reused behind a load balancer (set above the proxy's upstream keepalive
+# timeout), and queue bursts in the listen backlog instead of refusing them.
+keepalive = int(os.environ.get("WEB_KEEPALIVE", 5))
+backlog = int(os.environ.get("WEB_BACKLOG", 2048))
+
+# Draining: on SIGTERM / HUP, workers stop accepting and get graceful_timeout
+# seconds to finish in-flight requests. Workers silent for `timeout` seconds
+# are restarted. SSE streams end by themselves after EVENT_STREAM_MAX_AGE.
+timeout = int(os.environ.get("WEB_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+
+# Recycle workers now and then to bound slow leaks; jitter so they don't
+# all restart at once
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 5000))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 500))
+
+accesslog = os.environ.get("WEB_ACCESS_LOG", "-")
+# The default format with the path (%(U)s) in place of the request line:
+# query strings can carry credentials, e.g. the live feed's ?ticket=
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(m)s %(U)s %(H)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+loglevel = os.environ.get("WEB_LOG_LEVEL", "info")
+
+
+# Prometheus multiprocess mode: with PROMETHEUS_MULTIPROC_DIR set, workers
+# write metrics to files there and /metrics aggregates them. The directory
+# has to exist before preload_app imports the app (which creates the
+# master's files); on_starting then clears files left by earlier runs.
+_metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if _metrics_dir:
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def on_starting(server):
+    if _metrics_dir:
+        own = f"_{os.getpid()}.db"
+        for name in os.listdir(_metrics_dir):
+            if name.endswith(".db") and not name.endswith(own):
+                os.remove(os.path.join(_metrics_dir, name))
+
+
+def child_exit(server, worker):
+    if _metrics_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master (e.g. by preload) must not be
+    # shared with the children; close=False leaves them for the master.
+    from app import db
+
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -97,6 +97,13 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # The app turns SQLite foreign keys on for every connection; batch
+        # migrations recreate tables, and with them on, dropping the old
+        # table would cascade-delete rows that reference it.
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -106,6 +113,12 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+        # The connection goes back to the app's pool afterwards
+        if connection.dialect.name == 'sqlite':
+            connection.commit()
+            connection.exec_driver_sql('PRAGMA foreign_keys=ON')
+            connection.commit()
+
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,94 @@
+"""Cascade deletes from user/post and add deletion_job table
+
+Revision ID: 0b7d3e9a4c21
+Revises: f2a6c8d4e517
+Create Date: 2026-10-18 16:21:07.408513
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7d3e9a4c21'
+down_revision = 'f2a6c8d4e517'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table), children first
+FOREIGN_KEYS = [
+    ('like', 'user_id', 'user'),
+    ('like', 'post_id', 'post'),
+    ('comment', 'user_id', 'user'),
+    ('comment', 'post_id', 'post'),
+    ('post', 'user_id', 'user'),
+    ('property', 'user_id', 'user'),
+]
+
+# Gives SQLite's unnamed foreign keys a name batch mode can drop them by
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _fk_name(table, column, referred):
+    return f'fk_{table}_{column}_{referred}'
+
+
+def _replace_foreign_keys(old_name, ondelete):
+    for table in dict.fromkeys(t for t, _, _ in FOREIGN_KEYS):
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for t, column, referred in FOREIGN_KEYS:
+                if t != table:
+                    continue
+                batch_op.drop_constraint(old_name(t, column, referred), type_='foreignkey')
+                batch_op.create_foreign_key(
+                    _fk_name(t, column, referred), referred, [column], ['id'], ondelete=ondelete
+                )
+
+
+def upgrade():
+    # Rows left behind by earlier deletes would fail the new constraints
+    # (Postgres validates them when they are added)
+    op.execute('DELETE FROM "like" WHERE post_id NOT IN (SELECT id FROM post) OR user_id NOT IN (SELECT id FROM "user")')
+    op.execute('DELETE FROM comment WHERE post_id NOT IN (SELECT id FROM post) OR user_id NOT IN (SELECT id FROM "user")')
+    op.execute('DELETE FROM post WHERE user_id NOT IN (SELECT id FROM "user")')
+    op.execute('DELETE FROM property WHERE user_id NOT IN (SELECT id FROM "user")')
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DELETE FROM property_fts WHERE rowid NOT IN (SELECT id FROM property)')
+    # Counters and the dashboard rollup covered the purged rows too
+    op.execute(
+        'UPDATE post SET '
+        'like_count = (SELECT COUNT(*) FROM "like" WHERE "like".post_id = post.id), '
+        'comment_count = (SELECT COUNT(*) FROM comment WHERE comment.post_id = post.id)'
+    )
+    op.execute('DELETE FROM stat_counter')
+    op.execute(
+        'INSERT INTO stat_counter (name, value) '
+        'SELECT \'total_users\', COUNT(*) FROM "user" '
+        'UNION ALL SELECT \'total_posts\', COUNT(*) FROM post '
+        'UNION ALL SELECT \'total_properties\', COUNT(*) FROM property '
+        'UNION ALL SELECT \'pending_properties\', COUNT(*) FROM property WHERE status = \'pending\' '
+        'UNION ALL SELECT \'approved_properties\', COUNT(*) FROM property WHERE status = \'approved\''
+    )
+
+    if op.get_bind().dialect.name == 'sqlite':
+        old_name = _fk_name  # as named by NAMING_CONVENTION
+    else:
+        old_name = lambda table, column, referred: f'{table}_{column}_fkey'
+    _replace_foreign_keys(old_name, ondelete='CASCADE')
+
+    op.create_table('deletion_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('deletion_job')
+    _replace_foreign_keys(_fk_name, ondelete=None)
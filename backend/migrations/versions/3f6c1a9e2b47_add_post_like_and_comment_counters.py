@@ -0,0 +1,35 @@
+"""Add like_count and comment_count to Post
+
+Revision ID: 3f6c1a9e2b47
+Revises: 9ddbf4ade98a
+Create Date: 2026-10-18 09:12:41.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c1a9e2b47'
+down_revision = '9ddbf4ade98a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing rows
+    op.execute(
+        'UPDATE post SET '
+        'like_count = (SELECT COUNT(*) FROM "like" WHERE "like".post_id = post.id), '
+        'comment_count = (SELECT COUNT(*) FROM comment WHERE comment.post_id = post.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('comment_count')
+        batch_op.drop_column('like_count')
@@ -0,0 +1,30 @@
+"""Add deletion_job.updated_at heartbeat
+
+Revision ID: 5e1d9c7b3a80
+Revises: 0b7d3e9a4c21
+Create Date: 2026-10-18 21:05:42.163920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1d9c7b3a80'
+down_revision = '0b7d3e9a4c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('deletion_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Jobs from before the heartbeat: their last sign of life is when they
+    # finished or were queued
+    op.execute("UPDATE deletion_job SET updated_at = COALESCE(finished_at, created_at)")
+
+
+def downgrade():
+    with op.batch_alter_table('deletion_job', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,50 @@
+"""Add indexes for hot lookups
+
+Revision ID: a41d7e5c9f08
+Revises: 3f6c1a9e2b47
+Create Date: 2026-10-18 10:03:27.561930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41d7e5c9f08'
+down_revision = '3f6c1a9e2b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.create_index('ix_post_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_post_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('property', schema=None) as batch_op:
+        batch_op.create_index('ix_property_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_property_status_created_at_id', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_property_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.create_index('ix_comment_post_id_created_at_id', ['post_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('like', schema=None) as batch_op:
+        batch_op.create_index('ix_like_post_id', ['post_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('like', schema=None) as batch_op:
+        batch_op.drop_index('ix_like_post_id')
+
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.drop_index('ix_comment_post_id_created_at_id')
+
+    with op.batch_alter_table('property', schema=None) as batch_op:
+        batch_op.drop_index('ix_property_user_id_created_at_id')
+        batch_op.drop_index('ix_property_status_created_at_id')
+        batch_op.drop_index('ix_property_created_at_id')
+
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_user_id_created_at_id')
+        batch_op.drop_index('ix_post_created_at_id')
@@ -0,0 +1,31 @@
+"""Add media_blob table
+
+Revision ID: c7e2f05b8d19
+Revises: a41d7e5c9f08
+Create Date: 2026-10-18 11:26:04.913375
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2f05b8d19'
+down_revision = 'a41d7e5c9f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_blob',
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('extension', sa.String(length=10), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('digest')
+    )
+
+
+def downgrade():
+    op.drop_table('media_blob')
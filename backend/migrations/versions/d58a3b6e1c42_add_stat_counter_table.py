@@ -0,0 +1,30 @@
+"""Add stat_counter table
+
+Revision ID: d58a3b6e1c42
+Revises: c7e2f05b8d19
+Create Date: 2026-10-18 13:40:52.087214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd58a3b6e1c42'
+down_revision = 'c7e2f05b8d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Left empty: the first dashboard read (or `flask rebuild-stats`)
+    # fills it from a single aggregate query.
+    op.create_table('stat_counter',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('stat_counter')
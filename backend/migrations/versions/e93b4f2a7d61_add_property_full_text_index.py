@@ -0,0 +1,44 @@
+"""Add full-text index over property title/description
+
+Revision ID: e93b4f2a7d61
+Revises: d58a3b6e1c42
+Create Date: 2026-10-18 14:55:18.302671
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e93b4f2a7d61'
+down_revision = 'd58a3b6e1c42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # FTS5 table holding approved listings, keyed by property id
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS property_fts USING fts5(title, description)")
+        op.execute(
+            "INSERT INTO property_fts (rowid, title, description) "
+            "SELECT id, title, COALESCE(description, '') FROM property WHERE status = 'approved'"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE property ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+        )
+        op.execute("CREATE INDEX ix_property_search_vector ON property USING GIN (search_vector)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS property_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_property_search_vector")
+        op.execute("ALTER TABLE property DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,30 @@
+"""Add covering indexes for property listing filters
+
+Revision ID: f2a6c8d4e517
+Revises: e93b4f2a7d61
+Create Date: 2026-10-18 15:48:33.774109
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6c8d4e517'
+down_revision = 'e93b4f2a7d61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('property', schema=None) as batch_op:
+        batch_op.create_index('ix_property_status_listing_type_created_at_id', ['status', 'listing_type', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_property_status_price_id', ['status', 'price', 'id'], unique=False)
+        batch_op.create_index('ix_property_status_listing_type_price_id', ['status', 'listing_type', 'price', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('property', schema=None) as batch_op:
+        batch_op.drop_index('ix_property_status_listing_type_price_id')
+        batch_op.drop_index('ix_property_status_price_id')
+        batch_op.drop_index('ix_property_status_listing_type_created_at_id')
@@ -0,0 +1,183 @@
+"""Fixtures: one app on a seeded in-memory SQLite database for the session,
+and ``sql``, which records the statements a request issued.
+
+    python -m pytest tests
+"""
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import create_app, db  # noqa: E402
+from app.config import TestingConfig  # noqa: E402
+
+
+class Config(TestingConfig):
+    # one database for the whole session, whatever TEST_DATABASE_URL says:
+    # the schema and seed below are SQLite's
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    METRICS_ENABLED = False
+
+
+ADMIN_ID, ALICE_ID, BOB_ID = 1, 2, 3
+START = datetime(2026, 1, 1)
+
+
+# ------------------------------------------------
+# APP / DATABASE
+# ------------------------------------------------
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    app = create_app(Config)
+    app.static_folder = str(tmp_path_factory.mktemp("static"))
+
+    @app.after_request
+    def keep_query_stats(response):
+        # query_stats keeps them on g, which is gone once the request ends
+        from app.utils.query_stats import current_query_stats
+
+        Recorder.last_stats = current_query_stats()
+        return response
+
+    # not kept pushed: requests would share it, and its g, with each other
+    with app.app_context():
+        db.create_all()
+        seed()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def seed():
+    from app.models.user import User
+    from app.models.property import Property
+    from app.utils.search import reindex_properties
+    from app.utils.stats import rebuild_stats
+
+    db.session.add_all([
+        User(id=ADMIN_ID, name="Admin", email="admin@example.com", password="-", is_admin=True),
+        User(id=ALICE_ID, name="Alice", email="alice@example.com", password="-"),
+        User(id=BOB_ID, name="Bob", email="bob@example.com", password="-"),
+    ])
+    add_posts(30)
+    add_comments(post_id=1, count=3)
+
+    statuses = ("approved", "approved", "pending", "declined")
+    for i in range(40):
+        db.session.add(Property(
+            user_id=(ALICE_ID, BOB_ID)[i % 2],
+            title=f"Listing {i}",
+            description="Modern apartment" if i % 3 else "Family house",
+            price=1000 + 250 * i,
+            status=statuses[i % len(statuses)],
+            listing_type=("sale", "rent")[i % 2],
+            created_at=START + timedelta(hours=i),
+        ))
+    db.session.flush()
+    reindex_properties([row.id for row in db.session.query(Property.id)])
+    rebuild_stats()
+    db.session.commit()
+
+
+def add_posts(count):
+    """Add ``count`` posts by Alice and Bob, each with a like and a comment."""
+    from app.models.post import Post
+    from app.models.like import Like
+    from app.models.comment import Comment
+
+    offset = db.session.query(Post).count()
+    posts = [
+        Post(
+            user_id=(ALICE_ID, BOB_ID)[i % 2],
+            content=f"Post {i}",
+            created_at=START + timedelta(minutes=i),
+            like_count=1,
+            comment_count=1,
+        )
+        for i in range(offset, offset + count)
+    ]
+    db.session.add_all(posts)
+    db.session.flush()
+    for post in posts:
+        db.session.add(Like(user_id=ALICE_ID, post_id=post.id))
+        db.session.add(Comment(user_id=BOB_ID, post_id=post.id, content="Nice", created_at=post.created_at))
+    db.session.commit()
+
+
+def add_comments(post_id, count):
+    from app.models.comment import Comment
+    from app.models.post import Post
+
+    post = db.session.get(Post, post_id)
+    for i in range(count):
+        db.session.add(Comment(
+            user_id=ALICE_ID, post_id=post_id, content=f"Reply {i}",
+            created_at=post.created_at + timedelta(seconds=i + 1),
+        ))
+    post.comment_count += count
+    db.session.commit()
+
+
+@pytest.fixture
+def auth(app):
+    from app.utils.jwt_utils import create_token
+
+    def headers(user_id):
+        with app.app_context():   # signed with app.config["SECRET_KEY"]
+            return {"Authorization": f"Bearer {create_token(user_id)}"}
+
+    return headers
+
+
+# ------------------------------------------------
+# STATEMENT RECORDING
+# ------------------------------------------------
+class Recorder:
+    """Statements and query_stats of the requests made under ``record``."""
+
+    last_stats = None
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []   # (sql, parameters) as sent to the driver
+        self.count = None      # RequestQueryStats.count of the last request
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    @contextmanager
+    def record(self):
+        Recorder.last_stats = None
+        self.statements.clear()
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._on_execute)
+            stats = Recorder.last_stats
+            self.count = stats.count if stats is not None else 0
+
+    def selects(self):
+        return [(sql, params) for sql, params in self.statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.fixture
+def sql(app):
+    with app.app_context():
+        return Recorder(db.engine)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_listings_cache(app):
+    # the listing payloads are cached; their builder has to run to be measured
+    from app.utils.cache import response_cache, APPROVED_PROPERTIES
+
+    response_cache.invalidate(APPROVED_PROPERTIES)
@@ -0,0 +1,51 @@
+"""Config profiles, and the services that take their settings from them."""
+import pytest
+
+from app import create_app, init_services
+from app.config import ProductionConfig
+from conftest import Config
+
+
+def test_production_needs_a_secret_key(monkeypatch):
+    monkeypatch.setattr(ProductionConfig, "SECRET_KEY", None)
+
+    with pytest.raises(RuntimeError, match="SECRET_KEY"):
+        create_app("production")
+
+
+class TunedConfig(Config):
+    BCRYPT_ROUNDS = 5
+    PASSWORD_POOL_WORKERS = 0
+    RESPONSE_CACHE_TTL = 1
+    PRINCIPAL_CACHE_TTL = 2
+    EVENT_BUFFER_SIZE = 10
+    EVENT_STREAM_MAX_CONNECTIONS = 3
+    REPLICA_RETRY_AFTER = 4
+    SECRET_KEY = "tuned"
+
+
+@pytest.fixture
+def tuned_app(app):
+    yield create_app(TunedConfig)
+    # back to the session app's settings for the other tests
+    init_services(app)
+
+
+def test_services_use_the_profile(tuned_app):
+    import jwt
+    from app.utils import events, jwt_utils
+    from app.utils.cache import response_cache
+    from app.utils.passwords import password_service
+    from app.utils.replicas import replica_pool
+
+    assert password_service.workers == 0
+    assert password_service.hash_password("secret").startswith("$2b$05$")
+    assert response_cache.ttl == 1
+    assert jwt_utils._principal_cache.ttl == 2
+    assert events.broker._events.maxlen == 10
+    assert events.stream_slots.limit == 3
+    assert replica_pool.retry_after == 4
+
+    with tuned_app.app_context():
+        token = jwt_utils.create_token(1)
+    assert jwt.decode(token, "tuned", algorithms=["HS256"])["id"] == 1
@@ -0,0 +1,19 @@
+"""Datetimes leave the API as UTC. The database stores them naive, and a
+naive ISO string is parsed as local time by ``new Date()``."""
+from datetime import datetime
+
+from conftest import ALICE_ID
+
+
+def test_feed_times_are_utc(client, auth):
+    body = client.get("/api/users/posts/all?limit=1", headers=auth(ALICE_ID)).get_json()
+
+    assert body["posts"][0]["created_at"].endswith("Z")
+
+
+def test_fallback_encoders_mark_naive_datetimes_utc():
+    from app.utils.cache import _json_default
+    from app.utils.json_provider import _default
+
+    for encode in (_default, _json_default):
+        assert encode(datetime(2026, 1, 1, 8, 30)) == "2026-01-01T08:30:00+00:00"
@@ -0,0 +1,31 @@
+"""Tampered cursors are a 400, whatever the values decode to."""
+import pytest
+
+from app.utils.pagination import encode_cursor
+from conftest import ALICE_ID
+
+BAD_CURSORS = [
+    ("/api/users/posts/all", [None, None]),
+    ("/api/users/posts/all", ["2020-01-01", {"a": 1}]),
+    ("/api/users/posts/all", [20200101, 1]),
+    ("/api/users/posts/all", ["2020-01-01", True]),
+    ("/api/users/posts/all", ["2020-01-01", "1"]),
+    ("/api/users/posts/all", ["yesterday", 1]),
+    ("/api/users/properties/search?q=modern", [{"a": 1}, 1]),
+    ("/api/users/properties/search?q=modern", [-1.5, 2.5]),
+]
+
+
+@pytest.mark.parametrize("path, values", BAD_CURSORS)
+def test_bad_cursor_values_are_400(client, auth, path, values):
+    sep = "&" if "?" in path else "?"
+    response = client.get(f"{path}{sep}cursor={encode_cursor(*values)}", headers=auth(ALICE_ID))
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+def test_int_rank_is_a_valid_float_key(client, auth):
+    response = client.get(f"/api/users/properties/search?q=modern&cursor={encode_cursor(-1, 2)}", headers=auth(ALICE_ID))
+
+    assert response.status_code == 200
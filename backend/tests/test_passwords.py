@@ -0,0 +1,25 @@
+"""The hashing pool's queue cap holds while a timed-out hash is still running."""
+import time
+
+import pytest
+
+from app.utils.passwords import PasswordService, PasswordServiceBusy
+
+
+def test_timed_out_hash_keeps_its_slot_until_it_finishes():
+    # one worker, no queue: a single slot
+    service = PasswordService(rounds=13, workers=1, max_pending=0, timeout=0.05)
+    try:
+        with pytest.raises(PasswordServiceBusy, match="timed out"):
+            service.hash_password("secret")
+        # the child is still hashing, so there is nothing to hand out
+        with pytest.raises(PasswordServiceBusy, match="busy"):
+            service.hash_password("secret")
+
+        deadline = time.monotonic() + 30
+        while not service._slots.acquire(blocking=False):
+            assert time.monotonic() < deadline, "slot never came back"
+            time.sleep(0.05)
+        service._slots.release()
+    finally:
+        service.shutdown()
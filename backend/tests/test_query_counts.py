@@ -0,0 +1,80 @@
+"""Statements per request on the hot read routes, counted by the
+query_stats hook (app/utils/query_stats.py). The app runs with
+SQL_N_PLUS_ONE_STRICT, so a per-row query also fails these with
+NPlusOneError."""
+from conftest import ADMIN_ID, ALICE_ID, add_posts
+
+
+def _get(client, sql, path, headers):
+    # the first request from a user also loads the principal; warm it up
+    client.get("/api/users/posts/my-posts?limit=1", headers=headers)
+    with sql.record():
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+# ------------------------------------------------
+# FEED
+# ------------------------------------------------
+def test_feed_is_one_query(client, sql, auth):
+    body = _get(client, sql, "/api/users/posts/all", auth(ALICE_ID))
+
+    assert sql.count == 1
+    post = body["posts"][0]
+    assert post["user_name"] and post["likes"] == 1 and post["comments"] == 1
+    assert post["liked_by_current_user"] is True
+
+
+def test_feed_query_count_does_not_grow_with_posts(app, client, sql, auth):
+    headers = auth(ALICE_ID)
+    _get(client, sql, "/api/users/posts/all?limit=100", headers)
+    before = sql.count
+
+    with app.app_context():
+        add_posts(200)
+    body = _get(client, sql, "/api/users/posts/all?limit=100", headers)
+
+    assert len(body["posts"]) == 100
+    assert sql.count == before == 1
+
+
+def test_feed_cursor_page_is_one_query(client, sql, auth):
+    headers = auth(ALICE_ID)
+    first = _get(client, sql, "/api/users/posts/all?limit=5", headers)
+    second = _get(client, sql, f"/api/users/posts/all?limit=5&cursor={first['next_cursor']}", headers)
+
+    assert sql.count == 1
+    assert not {p["id"] for p in first["posts"]} & {p["id"] for p in second["posts"]}
+
+
+# ------------------------------------------------
+# LISTINGS
+# ------------------------------------------------
+def test_listings_are_page_plus_facets(client, sql, auth):
+    body = _get(client, sql, "/api/users/properties/all?listing_type=sale&sort=price_asc", auth(ALICE_ID))
+
+    assert sql.count == 2
+    prices = [p["price"] for p in body["properties"]]
+    assert prices == sorted(prices)
+    assert set(body["facets"]["listing_type"]) == {"sale"}
+
+
+def test_cached_listings_run_no_queries(client, sql, auth):
+    headers = auth(ALICE_ID)
+    _get(client, sql, "/api/users/properties/all", headers)
+    _get(client, sql, "/api/users/properties/all", headers)
+
+    assert sql.count == 0
+
+
+# ------------------------------------------------
+# ADMIN BOOTSTRAP
+# ------------------------------------------------
+def test_bootstrap_is_stats_plus_one_query_per_section(client, sql, auth):
+    body = _get(client, sql, "/api/admin/bootstrap?posts_limit=5", auth(ADMIN_ID))
+
+    assert sql.count == 4
+    assert len(body["posts"]["items"]) == 5 and body["posts"]["next_cursor"]
+    assert body["stats"]["total_users"] == 3
+
@@ -0,0 +1,41 @@
+"""How /api/users/posts/stream refuses a connection. The client reads the
+status: 401 means get a new ticket, anything else means retry the same one
+later (after Retry-After if there is one)."""
+import datetime
+
+import jwt
+from conftest import ALICE_ID
+
+STREAM = "/api/users/posts/stream"
+
+
+def _ticket(app, seconds):
+    payload = {
+        "id": ALICE_ID,
+        "scope": "stream",
+        "exp": datetime.datetime.utcnow() + datetime.timedelta(seconds=seconds),
+    }
+    return jwt.encode(payload, app.config["SECRET_KEY"], algorithm="HS256")
+
+
+def test_expired_ticket_is_401(app, client):
+    response = client.get(f"{STREAM}?ticket={_ticket(app, -1)}")
+
+    assert response.status_code == 401
+
+
+def test_login_token_is_not_a_ticket(client, auth):
+    token = auth(ALICE_ID)["Authorization"].split(" ")[1]
+
+    assert client.get(f"{STREAM}?ticket={token}").status_code == 401
+
+
+def test_over_the_cap_is_503_with_retry_after(app, client, monkeypatch):
+    from app.utils.events import stream_slots
+
+    monkeypatch.setattr(stream_slots, "acquire", lambda: False)
+    response = client.get(f"{STREAM}?ticket={_ticket(app, 60)}")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert "Retry-After" in response.headers["Access-Control-Expose-Headers"]
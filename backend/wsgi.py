@@ -0,0 +1,11 @@
+"""Production entry point:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Settings are in gunicorn.conf.py. run.py is only for the debug server.
+"""
+import os
+
+from app import create_app
+
+app = create_app(os.environ.get("APP_ENV", "production"))
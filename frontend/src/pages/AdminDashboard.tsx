@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import axios from "@/api/axiosConfig";
 
 interface Stats {
@@ -37,16 +37,38 @@ interface PropertyItem {
   created_at: string;
 }
 
+type Section = "users" | "posts" | "properties";
+
+const LoadMore = ({ onClick, loading }: { onClick: () => void; loading: boolean }) => (
+  <div className="mt-3 text-center">
+    <button
+      onClick={onClick}
+      className="px-3 py-1 rounded bg-slate-100 hover:bg-slate-200 text-sm"
+      disabled={loading}
+    >
+      {loading ? "Loading..." : "Load more"}
+    </button>
+  </div>
+);
+
 const AdminDashboard = () => {
   const [stats, setStats] = useState<Stats | null>(null);
   const [users, setUsers] = useState<UserItem[]>([]);
   const [posts, setPosts] = useState<PostItem[]>([]);
   const [properties, setProperties] = useState<PropertyItem[]>([]);
+  // next page of each list (from bootstrap, then from /admin/<section>/all)
+  const [cursors, setCursors] = useState<Record<Section, string | null>>({
+    users: null,
+    posts: null,
+    properties: null,
+  });
+  const [loadingMore, setLoadingMore] = useState<Section | null>(null);
 
   const [loading, setLoading] = useState(true);
   const [actionLoading, setActionLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [successMessage, setSuccessMessage] = useState<string | null>(null);
+  const mounted = useRef(true);
 
   const token = localStorage.getItem("token") || "";
 
@@ -63,17 +85,18 @@ const AdminDashboard = () => {
     setLoading(true);
     setError(null);
     try {
-      const [statsRes, usersRes, postsRes, propsRes] = await Promise.all([
-        api.get("/admin/stats"),
-        api.get("/admin/users/all"),
-        api.get("/admin/posts/all"),
-        api.get("/admin/properties/all"),
-      ]);
-
-      setStats(statsRes.data as Stats);
-      setUsers(usersRes.data as UserItem[]);
-      setPosts(postsRes.data as PostItem[]);
-      setProperties(propsRes.data as PropertyItem[]);
+      // One composite request instead of four parallel ones
+      const { data } = await api.get("/admin/bootstrap");
+
+      setStats(data.stats as Stats);
+      setUsers(data.users.items as UserItem[]);
+      setPosts(data.posts.items as PostItem[]);
+      setProperties(data.properties.items as PropertyItem[]);
+      setCursors({
+        users: data.users.next_cursor ?? null,
+        posts: data.posts.next_cursor ?? null,
+        properties: data.properties.next_cursor ?? null,
+      });
     } catch (err: any) {
       console.error("Admin fetch error:", err);
       const msg =
@@ -87,27 +110,92 @@ const AdminDashboard = () => {
   };
 
   useEffect(() => {
+    mounted.current = true;
     fetchAll();
+    return () => {
+      mounted.current = false;
+    };
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  // append the next page of one list; the cursor comes back in X-Next-Cursor
+  const loadMore = async (section: Section) => {
+    const cursor = cursors[section];
+    if (!cursor) return;
+    setLoadingMore(section);
+    setError(null);
+    try {
+      const res = await api.get(`/admin/${section}/all`, { params: { cursor } });
+      const items = res.data as any[];
+      if (section === "users") setUsers((prev) => [...prev, ...items]);
+      if (section === "posts") setPosts((prev) => [...prev, ...items]);
+      if (section === "properties") setProperties((prev) => [...prev, ...items]);
+      const next = res.headers["x-next-cursor"];
+      setCursors((prev) => ({ ...prev, [section]: typeof next === "string" && next ? next : null }));
+    } catch (err: any) {
+      const msg = err?.response?.data?.error || `Failed to load more ${section}`;
+      setError(String(msg));
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
+  // Post / property actions update the loaded lists in place, so pages
+  // loaded further down stay put, and only re-read the stats
+  const fetchStats = async () => {
+    try {
+      const { data } = await api.get("/admin/stats");
+      setStats(data as Stats);
+    } catch (err) {
+      console.error("Admin stats error:", err);
+    }
+  };
+
+  const setPropertyStatus = (id: number, status: string) =>
+    setProperties((prev) => prev.map((pr) => (pr.id === id ? { ...pr, status } : pr)));
+
   // helper to show success and auto-clear
   const showSuccess = (msg: string) => {
     setSuccessMessage(msg);
     setTimeout(() => setSuccessMessage(null), 3000);
   };
 
+  // Large accounts are deleted by a background job (202 + job); poll it
+  // until it is done or failed. Null if the page was left meanwhile.
+  const waitForDeletion = async (jobId: number) => {
+    for (;;) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      if (!mounted.current) return null;
+      const { data: job } = await api.get(`/admin/users/delete-jobs/${jobId}`);
+      if (job.status === "done" || job.status === "failed") return job;
+      setSuccessMessage(
+        job.total ? `Deleting user… ${job.deleted} of ${job.total} rows` : "Deleting user…"
+      );
+    }
+  };
+
   // ADMIN ACTIONS
   const handleDeleteUser = async (id: number) => {
     if (!confirm("Delete this user? This is irreversible.")) return;
     setActionLoading(true);
     setError(null);
     try {
-      await api.delete(`/admin/users/delete/${id}`);
+      const res = await api.delete(`/admin/users/delete/${id}`);
+      if (res.status === 202) {
+        setSuccessMessage("User deletion in progress…");
+        const job = await waitForDeletion(res.data.job.id);
+        if (!job) return;
+        if (job.status === "failed") {
+          setSuccessMessage(null);
+          setError(job.error || "User deletion failed");
+          return;
+        }
+      }
       showSuccess("User deleted");
       await fetchAll();
     } catch (err: any) {
       const msg = err?.response?.data?.error || "Error deleting user";
+      setSuccessMessage(null);
       setError(String(msg));
     } finally {
       setActionLoading(false);
@@ -121,7 +209,8 @@ const AdminDashboard = () => {
     try {
       await api.delete(`/admin/posts/delete/${id}`);
       showSuccess("Post deleted");
-      await fetchAll();
+      setPosts((prev) => prev.filter((p) => p.id !== id));
+      await fetchStats();
     } catch (err: any) {
       const msg = err?.response?.data?.error || "Error deleting post";
       setError(String(msg));
@@ -136,7 +225,8 @@ const AdminDashboard = () => {
     try {
       await api.put(`/admin/properties/approve/${id}`);
       showSuccess("Property approved");
-      await fetchAll();
+      setPropertyStatus(id, "approved");
+      await fetchStats();
     } catch (err: any) {
       const msg = err?.response?.data?.error || "Error approving property";
       setError(String(msg));
@@ -152,7 +242,8 @@ const AdminDashboard = () => {
     try {
       await api.put(`/admin/properties/decline/${id}`);
       showSuccess("Property declined");
-      await fetchAll();
+      setPropertyStatus(id, "declined");
+      await fetchStats();
     } catch (err: any) {
       const msg = err?.response?.data?.error || "Error declining property";
       setError(String(msg));
@@ -168,7 +259,8 @@ const AdminDashboard = () => {
     try {
       await api.delete(`/admin/properties/delete/${id}`);
       showSuccess("Property deleted");
-      await fetchAll();
+      setProperties((prev) => prev.filter((pr) => pr.id !== id));
+      await fetchStats();
     } catch (err: any) {
       const msg = err?.response?.data?.error || "Error deleting property";
       setError(String(msg));
@@ -243,7 +335,9 @@ const AdminDashboard = () => {
       <section className="bg-white p-4 rounded shadow">
         <div className="flex items-center justify-between mb-3">
           <h2 className="text-xl font-semibold">Users</h2>
-          <div className="text-sm text-gray-500">{users.length} total</div>
+          <div className="text-sm text-gray-500">
+            {users.length} of {stats?.total_users ?? users.length}
+          </div>
         </div>
 
         <div className="overflow-x-auto">
@@ -285,13 +379,18 @@ const AdminDashboard = () => {
             </tbody>
           </table>
         </div>
+        {cursors.users && (
+          <LoadMore onClick={() => loadMore("users")} loading={loadingMore === "users"} />
+        )}
       </section>
 
       {/* Posts */}
       <section className="bg-white p-4 rounded shadow">
         <div className="flex items-center justify-between mb-3">
           <h2 className="text-xl font-semibold">Community Posts</h2>
-          <div className="text-sm text-gray-500">{posts.length} total</div>
+          <div className="text-sm text-gray-500">
+            {posts.length} of {stats?.total_posts ?? posts.length}
+          </div>
         </div>
 
         <div className="space-y-3">
@@ -326,13 +425,18 @@ const AdminDashboard = () => {
             <div className="text-gray-500">No posts found.</div>
           )}
         </div>
+        {cursors.posts && (
+          <LoadMore onClick={() => loadMore("posts")} loading={loadingMore === "posts"} />
+        )}
       </section>
 
       {/* Properties */}
       <section className="bg-white p-4 rounded shadow">
         <div className="flex items-center justify-between mb-3">
           <h2 className="text-xl font-semibold">Property Listings</h2>
-          <div className="text-sm text-gray-500">{properties.length} total</div>
+          <div className="text-sm text-gray-500">
+            {properties.length} of {stats?.total_properties ?? properties.length}
+          </div>
         </div>
 
         <div className="space-y-3">
@@ -395,10 +499,13 @@ const AdminDashboard = () => {
             <div className="text-gray-500">No properties found.</div>
           )}
         </div>
+        {cursors.properties && (
+          <LoadMore onClick={() => loadMore("properties")} loading={loadingMore === "properties"} />
+        )}
       </section>
 
       <div className="text-sm text-gray-500">
-        Tip: actions refresh automatically. Use "Refresh" to re-fetch at any time.
+        Tip: actions update the lists in place. Use "Refresh" to re-fetch from the first page.
       </div>
     </div>
   );
@@ -41,12 +41,14 @@ interface Post {
 
 const Community: React.FC = () => {
   const [posts, setPosts] = useState<Post[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [newPost, setNewPost] = useState("");
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const [openComments, setOpenComments] = useState<{ [k: number]: boolean }>({});
   const [comments, setComments] = useState<{ [k: number]: CommentItem[] }>({});
+  const [commentCursors, setCommentCursors] = useState<{ [k: number]: string | null }>({});
   const [newComment, setNewComment] = useState<{ [k: number]: string }>({});
 
   // normalize post object returned from backend to shape the UI expects
@@ -75,13 +77,16 @@ const Community: React.FC = () => {
     return p as Post;
   };
 
-  const fetchPosts = async () => {
+  // Without a cursor: the first page, replacing the feed. With one: the
+  // next page, appended (posts pushed live meanwhile are skipped).
+  const fetchPosts = async (cursor?: string) => {
     try {
       setLoading(true);
       setError(null);
       const token = localStorage.getItem("token");
-      const res = await axios.get<{ posts: any[] }>("/api/users/posts/all", {
+      const res = await axios.get<{ posts: any[]; next_cursor?: string | null }>("/api/users/posts/all", {
         headers: { Authorization: `Bearer ${token}` },
+        params: cursor ? { cursor } : undefined,
       });
 
       const rawPosts = Array.isArray(res.data?.posts) ? res.data.posts : [];
@@ -89,7 +94,10 @@ const Community: React.FC = () => {
         .map(normalizePost)
         .filter((x): x is Post => x !== null);
 
-      setPosts(normalized);
+      setPosts((prev) =>
+        cursor ? [...prev, ...normalized.filter((p) => !prev.some((q) => q.id === p.id))] : normalized
+      );
+      setNextCursor(res.data?.next_cursor ?? null);
     } catch (err) {
       console.error("Failed to load posts:", err);
       setError("Failed to load posts");
@@ -98,14 +106,19 @@ const Community: React.FC = () => {
     }
   };
 
-  const fetchComments = async (postId: number) => {
+  const fetchComments = async (postId: number, cursor?: string) => {
     try {
       const token = localStorage.getItem("token");
-      const res = await axios.get<{ comments: CommentItem[] }>(
+      const res = await axios.get<{ comments: CommentItem[]; next_cursor?: string | null }>(
         `/api/users/posts/${postId}/comments`,
-        { headers: { Authorization: `Bearer ${token}` } }
+        {
+          headers: { Authorization: `Bearer ${token}` },
+          params: cursor ? { cursor } : undefined,
+        }
       );
-      setComments((prev) => ({ ...prev, [postId]: res.data.comments || [] }));
+      const page = res.data.comments || [];
+      setComments((prev) => ({ ...prev, [postId]: cursor ? [...(prev[postId] || []), ...page] : page }));
+      setCommentCursors((prev) => ({ ...prev, [postId]: res.data.next_cursor ?? null }));
     } catch (err) {
       console.error("Failed to load comments", err);
       setComments((p) => ({ ...p, [postId]: [] }));
@@ -124,16 +137,17 @@ const Community: React.FC = () => {
 
     try {
       const token = localStorage.getItem("token");
-      await axios.post(
+      const res = await axios.post<{ comments: number }>(
         `/api/users/posts/${postId}/comment`,
         { content },
         { headers: { Authorization: `Bearer ${token}` } }
       );
       await fetchComments(postId);
 
+      // absolute count, like the live feed's, so the two never add up twice
       setPosts((prev) =>
         prev.map((p) =>
-          p.id === postId ? { ...p, comments: (p.comments ?? 0) + 1 } : p
+          p.id === postId ? { ...p, comments: res.data.comments } : p
         )
       );
 
@@ -146,7 +160,7 @@ const Community: React.FC = () => {
   const toggleLike = async (postId: number) => {
     try {
       const token = localStorage.getItem("token");
-      await axios.post(
+      const res = await axios.post<{ liked: boolean; likes: number }>(
         `/api/users/posts/${postId}/like`,
         null,
         { headers: { Authorization: `Bearer ${token}` } }
@@ -157,8 +171,8 @@ const Community: React.FC = () => {
           p.id === postId
             ? {
                 ...p,
-                liked_by_current_user: !p.liked_by_current_user,
-                likes: p.liked_by_current_user ? (p.likes ?? 1) - 1 : (p.likes ?? 0) + 1,
+                liked_by_current_user: res.data.liked,
+                likes: res.data.likes,
               }
             : p
         )
@@ -206,6 +220,123 @@ const Community: React.FC = () => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  // Live updates: apply pushed posts / counts instead of refetching the feed.
+  // The stream authenticates with a short-lived ticket in the URL (never the
+  // login token). It is read with fetch rather than EventSource so a refused
+  // connection's status is visible: a 401 means the ticket has expired and a
+  // new one is needed; anything else is retried with the same ticket after
+  // Retry-After or an exponential backoff, resuming from the last event id.
+  useEffect(() => {
+    const token = localStorage.getItem("token");
+    if (!token) return;
+
+    const controller = new AbortController();
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let ticket = "";
+    let lastEventId = "";
+    let failures = 0;
+
+    const handlers: Record<string, (data: any) => void> = {
+      post: (data) => {
+        const post = normalizePost(data);
+        if (!post) return;
+        setPosts((prev) => (prev.some((p) => p.id === post.id) ? prev : [post, ...prev]));
+      },
+      post_deleted: ({ id }) => {
+        setPosts((prev) => prev.filter((p) => p.id !== id));
+      },
+      counts: ({ post_id, ...counts }) => {
+        setPosts((prev) => prev.map((p) => (p.id === post_id ? { ...p, ...counts } : p)));
+      },
+      // we fell too far behind to resume
+      reset: () => {
+        fetchPosts();
+      },
+    };
+
+    // one SSE event block: "event:", "data:" and "id:" lines, ":" comments
+    const dispatch = (block: string) => {
+      let event = "message";
+      const data: string[] = [];
+      for (const line of block.split("\n")) {
+        if (!line || line.startsWith(":")) continue;
+        const colon = line.indexOf(":");
+        const field = colon < 0 ? line : line.slice(0, colon);
+        const value = colon < 0 ? "" : line.slice(colon + 1).replace(/^ /, "");
+        if (field === "event") event = value;
+        else if (field === "data") data.push(value);
+        else if (field === "id") lastEventId = value;
+      }
+      if (data.length && handlers[event]) handlers[event](JSON.parse(data.join("\n")));
+    };
+
+    // 3 s, doubling up to 5 min, and never sooner than the server asked
+    const retryLater = (retryAfter = 0) => {
+      const delay = Math.min(3 * 2 ** failures, 300);
+      failures += 1;
+      retry = setTimeout(connect, Math.max(delay, retryAfter) * 1000);
+    };
+
+    const connect = async () => {
+      try {
+        if (!ticket) {
+          const res = await axios.post(
+            "/api/users/posts/stream-ticket",
+            {},
+            { headers: { Authorization: `Bearer ${token}` }, signal: controller.signal }
+          );
+          ticket = res.data.ticket;
+        }
+
+        const params = new URLSearchParams({ ticket });
+        if (lastEventId) params.set("last_event_id", lastEventId);
+        const res = await fetch(`${axios.defaults.baseURL}/api/users/posts/stream?${params}`, {
+          signal: controller.signal,
+        });
+
+        if (res.status === 401) {
+          // the ticket has expired: get a new one, straight away the first time
+          ticket = "";
+          if (failures === 0) {
+            failures = 1;
+            connect();
+            return;
+          }
+        }
+        if (!res.ok || !res.body) {
+          retryLater(Number(res.headers.get("Retry-After")) || 0);
+          return;
+        }
+
+        failures = 0;
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          const blocks = (buffer + value).split("\n\n");
+          buffer = blocks.pop() ?? "";
+          blocks.forEach(dispatch);
+        }
+        // the server ends streams after a while; pick up where this one left off
+        retryLater();
+      } catch (err: any) {
+        if (controller.signal.aborted) return;
+        if (err?.response?.status === 401) return; // logged out
+        console.error("Live updates unavailable:", err);
+        retryLater(Number(err?.response?.headers?.["retry-after"]) || 0);
+      }
+    };
+
+    connect();
+
+    return () => {
+      controller.abort();
+      clearTimeout(retry);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
   return (
     <>
       {/* HERO SECTION */}
@@ -309,6 +440,15 @@ const Community: React.FC = () => {
                         </div>
                       ))}
                     </div>
+
+                    {commentCursors[post.id] && (
+                      <button
+                        className="mt-3 text-sm text-blue-700 hover:underline"
+                        onClick={() => fetchComments(post.id, commentCursors[post.id] ?? undefined)}
+                      >
+                        Load more comments
+                      </button>
+                    )}
                   </div>
                 )}
               </div>
@@ -318,6 +458,16 @@ const Community: React.FC = () => {
               {loading ? "Loading posts..." : "No posts yet. Be the first to post!"}
             </div>
           )}
+
+          {nextCursor && posts.length > 0 && (
+            <button
+              onClick={() => fetchPosts(nextCursor)}
+              disabled={loading}
+              className="w-full border border-blue-700 text-blue-700 hover:bg-blue-50 py-2 rounded-lg disabled:opacity-50"
+            >
+              {loading ? "Loading..." : "Load more"}
+            </button>
+          )}
         </div>
       </div>
     </>
@@ -1,4 +1,4 @@
-import { useEffect, useState, ChangeEvent, FormEvent } from "react";
+import { useEffect, useRef, useState, ChangeEvent, FormEvent } from "react";
 import { Link } from "react-router-dom";
 import axios from "@/api/axiosConfig";
 import {
@@ -39,10 +39,19 @@ interface Property {
   type?: string;
 }
 
+type Sort = "newest" | "oldest" | "price_asc" | "price_desc";
+
 const Properties = () => {
   const [properties, setProperties] = useState<Property[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
   const [listingType, setListingType] = useState<"all" | "sale" | "rent">("all");
+  const [minPrice, setMinPrice] = useState("");
+  const [maxPrice, setMaxPrice] = useState("");
+  const [sort, setSort] = useState<Sort>("newest");
+  // id of the latest request; responses to older ones are dropped
+  const requestId = useRef(0);
 
   // Form state
   const [title, setTitle] = useState("");
@@ -51,26 +60,60 @@ const Properties = () => {
   const [file, setFile] = useState<File | null>(null);
   const [newListingType, setNewListingType] = useState<"sale" | "rent">("sale");
 
-  // Fetch all approved properties
-  const fetchProperties = async () => {
+  // Approved properties, filtered and sorted by the server. A search term
+  // goes to the full-text search (ranked by match) instead of the filters.
+  // With a cursor, the next page is appended.
+  const fetchProperties = async (cursor?: string) => {
+    const id = ++requestId.current;
+    const term = searchTerm.trim();
+    const params: Record<string, string> = {};
+    if (term) {
+      params.q = term;
+    } else {
+      if (listingType !== "all") params.listing_type = listingType;
+      if (minPrice) params.min_price = minPrice;
+      if (maxPrice) params.max_price = maxPrice;
+      params.sort = sort;
+    }
+    if (cursor) params.cursor = cursor;
+
     try {
       const token = localStorage.getItem("token");
-      const res = await axios.get<{ properties: Property[] }>(
-        "/api/users/properties/all",
+      const res = await axios.get<{ properties: Property[]; next_cursor?: string | null }>(
+        term ? "/api/users/properties/search" : "/api/users/properties/all",
         {
           headers: { Authorization: `Bearer ${token}` },
+          params,
         }
       );
-      setProperties(res.data.properties || []);
+      if (id !== requestId.current) return;
+      const page = res.data.properties || [];
+      setProperties((prev) => (cursor ? [...prev, ...page] : page));
+      setNextCursor(res.data.next_cursor ?? null);
     } catch (err) {
+      if (id !== requestId.current) return;
       console.error("Error fetching properties:", err);
-      setProperties([]);
+      if (!cursor) {
+        setProperties([]);
+        setNextCursor(null);
+      }
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    await fetchProperties(nextCursor);
+    setLoadingMore(false);
+  };
+
+  // Refetch from the first page when the search or filters change; typing
+  // is debounced so every keystroke doesn't become a request
   useEffect(() => {
-    fetchProperties();
-  }, []);
+    const timer = setTimeout(() => fetchProperties(), 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm, listingType, minPrice, maxPrice, sort]);
 
   // Handle file selection
   const handleFileChange = (e: ChangeEvent<HTMLInputElement>) => {
@@ -124,13 +167,6 @@ const Properties = () => {
     }
   };
 
-  // Filtered properties
-  const filteredProperties = properties.filter((p) => {
-    const matchesText = p.title.toLowerCase().includes(searchTerm.toLowerCase()) || p.description.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesListing = listingType === "all" || p.listingType === listingType;
-    return matchesText && matchesListing;
-  });
-
   return (
     <div className="min-h-screen">
       {/* Hero Section */}
@@ -159,11 +195,13 @@ const Properties = () => {
             />
           </div>
 
-          {/* <Select
+          {/* Filters and sort apply when browsing; a search is ranked by match */}
+          <Select
             value={listingType}
             onValueChange={(v) => setListingType(v as "all" | "sale" | "rent")}
+            disabled={!!searchTerm.trim()}
           >
-            <SelectTrigger>
+            <SelectTrigger className="md:w-40">
               <SelectValue placeholder="Filter Sale / Rent" />
             </SelectTrigger>
             <SelectContent>
@@ -171,13 +209,48 @@ const Properties = () => {
               <SelectItem value="sale">For Sale</SelectItem>
               <SelectItem value="rent">For Rent</SelectItem>
             </SelectContent>
-          </Select> */}
+          </Select>
+
+          <Input
+            placeholder="Min price"
+            type="number"
+            min={0}
+            className="md:w-32"
+            value={minPrice}
+            onChange={(e) => setMinPrice(e.target.value)}
+            disabled={!!searchTerm.trim()}
+          />
+          <Input
+            placeholder="Max price"
+            type="number"
+            min={0}
+            className="md:w-32"
+            value={maxPrice}
+            onChange={(e) => setMaxPrice(e.target.value)}
+            disabled={!!searchTerm.trim()}
+          />
+
+          <Select
+            value={sort}
+            onValueChange={(v) => setSort(v as Sort)}
+            disabled={!!searchTerm.trim()}
+          >
+            <SelectTrigger className="md:w-44">
+              <SelectValue placeholder="Sort" />
+            </SelectTrigger>
+            <SelectContent>
+              <SelectItem value="newest">Newest first</SelectItem>
+              <SelectItem value="oldest">Oldest first</SelectItem>
+              <SelectItem value="price_asc">Price: low to high</SelectItem>
+              <SelectItem value="price_desc">Price: high to low</SelectItem>
+            </SelectContent>
+          </Select>
         </section>
 
         {/* Properties Grid */}
         <section className="grid md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredProperties.length > 0 ? (
-            filteredProperties.map((property) => (
+          {properties.length > 0 ? (
+            properties.map((property) => (
               <Card
                 key={property.id}
                 className="group hover:shadow-lg transition-all duration-300 overflow-hidden"
@@ -246,6 +319,14 @@ const Properties = () => {
           )}
         </section>
 
+        {nextCursor && (
+          <div className="flex justify-center mt-8 mb-12">
+            <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          </div>
+        )}
+
         {/* Add Property Form */}
         <section className="mb-12">
           <h2 className="text-2xl font-bold mb-4">Add New Property</h2>
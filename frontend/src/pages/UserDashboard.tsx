@@ -52,6 +52,9 @@ const UserDashboard: React.FC = () => {
   const [profile, setProfile] = useState<UserProfile | null>(null);
   const [posts, setPosts] = useState<Post[]>([]);
   const [properties, setProperties] = useState<Property[]>([]);
+  // cursors for the next page of each list; null once it is complete
+  const [postsCursor, setPostsCursor] = useState<string | null>(null);
+  const [propertiesCursor, setPropertiesCursor] = useState<string | null>(null);
   const [activeTab, setActiveTab] = useState<"stats" | "posts" | "properties" | "admin">("stats");
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -77,34 +80,41 @@ const UserDashboard: React.FC = () => {
     }
   };
 
-  const fetchPosts = async () => {
+  // With a cursor, appends the next page (without the page-wide spinner)
+  const fetchPosts = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (!cursor) setLoading(true);
       const token = localStorage.getItem("token");
-      const { data } = await api.get("/posts/my-posts", {
+      const { data } = await api.get<{ posts: Post[]; next_cursor?: string | null }>("/posts/my-posts", {
         headers: { Authorization: `Bearer ${token}` },
+        params: cursor ? { cursor } : undefined,
       });
-      setPosts((data as any).posts || (data as Post[]));
+      const page = data.posts || [];
+      setPosts((prev) => (cursor ? [...prev, ...page] : page));
+      setPostsCursor(data.next_cursor ?? null);
     } catch (err) {
       setError("Failed to load posts");
     } finally {
-      setLoading(false);
+      if (!cursor) setLoading(false);
     }
   };
 
-  const fetchUserProperties = async () => {
+  const fetchUserProperties = async (cursor?: string) => {
     try {
       const token = localStorage.getItem("token");
-      const res = await axios.get<{ properties: Property[] }>(
+      const res = await axios.get<{ properties: Property[]; next_cursor?: string | null }>(
         "/api/users/properties/my-properties",
         {
           headers: { Authorization: `Bearer ${token}` },
+          params: cursor ? { cursor } : undefined,
         }
       );
-      setProperties(res.data.properties || []);
+      const page = res.data.properties || [];
+      setProperties((prev) => (cursor ? [...prev, ...page] : page));
+      setPropertiesCursor(res.data.next_cursor ?? null);
     } catch (err) {
       console.error("Error loading user properties:", err);
-      setProperties([]);
+      if (!cursor) setProperties([]);
     }
   };
 
@@ -262,10 +272,10 @@ const UserDashboard: React.FC = () => {
       {activeTab === "stats" && (
         <div className="grid grid-cols-3 gap-4">
           <div className="p-4 border rounded bg-green-50">
-            Posts: {posts.length}
+            Posts: {posts.length}{postsCursor ? "+" : ""}
           </div>
           <div className="p-4 border rounded bg-yellow-50">
-            Properties: {properties.length}
+            Properties: {properties.length}{propertiesCursor ? "+" : ""}
           </div>
           <div className="p-4 border rounded bg-blue-50">
             Profile Loaded
@@ -296,6 +306,15 @@ const UserDashboard: React.FC = () => {
               </button>
             </div>
           ))}
+
+          {postsCursor && (
+            <button
+              onClick={() => fetchPosts(postsCursor)}
+              className="w-full bg-gray-200 px-4 py-2 rounded"
+            >
+              Load more
+            </button>
+          )}
         </div>
       )}
 
@@ -322,6 +341,15 @@ const UserDashboard: React.FC = () => {
               </button>
             </div>
           ))}
+
+          {propertiesCursor && (
+            <button
+              onClick={() => fetchUserProperties(propertiesCursor)}
+              className="w-full bg-gray-200 px-4 py-2 rounded"
+            >
+              Load more
+            </button>
+          )}
         </div>
       )}
     </div>